@@ -0,0 +1,224 @@
+"""
+bench_rules.py
+
+Benchmarks for the rule engine hot paths.
+
+Every benchmark runs over fixed, seeded hand corpora so that numbers are
+comparable between commits. Results are written as JSON.
+
+By default the decomposition cache is cleared before every timed repeat
+(cold), so decompose_hand and everything built on it is really measured
+and numbers stay comparable with commits from before the cache. --warm
+keeps the cache across repeats to measure the cache-hit path instead.
+
+Usage:
+    python benchmarks/bench_rules.py [--out bench_output.json]
+                                     [--size 200] [--repeat 5] [--seed 2024]
+                                     [--compare previous.json] [--warm]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reach_conn_checker.network_rules import (
+    _parse_hand, validate_packet_structure, decompose_hand,
+    check_protocol_readiness, check_discard_for_tenpai, clear_decompose_cache,
+)
+from reach_conn_checker.yaku_rules import YakuChecker
+from reach_conn_checker.score_counter import ScoreCalculator
+from reach_conn_checker.tiles import TILE_NAMES
+
+# --- Corpora ---
+# Each corpus is a list of (hand14, hand13) pairs of tile string lists.
+
+def _full_deck():
+    return [t for t in TILE_NAMES for _ in range(4)]
+
+def _random_agari(rng, suits):
+    """Builds a complete hand (4 melds + pair) from the given tile slots."""
+    while True:
+        counts = [0] * 34
+        hand = []
+        for _ in range(4):
+            start = rng.choice(suits)
+            if start < 27 and start % 9 <= 6 and rng.random() < 0.6:
+                meld = [start, start + 1, start + 2]
+            else:
+                meld = [start] * 3
+            for t in meld:
+                counts[t] += 1
+            hand.extend(meld)
+        pair = rng.choice(suits)
+        counts[pair] += 2
+        hand.extend([pair, pair])
+        if max(counts) <= 4:
+            return [TILE_NAMES[t] for t in hand]
+
+def corpus_random(rng, size):
+    deck = _full_deck()
+    corpus = []
+    for _ in range(size):
+        hand = rng.sample(deck, 14)
+        corpus.append((hand, hand[:13]))
+    return corpus
+
+def corpus_tenpai(rng, size):
+    corpus = []
+    all_slots = list(range(34))
+    for _ in range(size):
+        agari = _random_agari(rng, all_slots)
+        rng.shuffle(agari)
+        hand13 = agari[:13]
+        # Add a random tile: discarding it leads back to Tenpai
+        hand14 = hand13 + [rng.choice(TILE_NAMES)]
+        corpus.append((hand14, hand13))
+    return corpus
+
+def corpus_chinitsu(rng, size):
+    corpus = []
+    for _ in range(size):
+        base = rng.choice([0, 9, 18])
+        agari = _random_agari(rng, list(range(base, base + 9)))
+        rng.shuffle(agari)
+        corpus.append((agari, agari[:13]))
+    return corpus
+
+def corpus_seven_pairs(rng, size):
+    corpus = []
+    for _ in range(size):
+        kinds = rng.sample(TILE_NAMES, 7)
+        hand = [t for t in kinds for _ in range(2)]
+        rng.shuffle(hand)
+        corpus.append((hand, hand[:13]))
+    return corpus
+
+CORPORA = {
+    'random': corpus_random,
+    'tenpai': corpus_tenpai,
+    'chinitsu': corpus_chinitsu,
+    'seven_pairs': corpus_seven_pairs,
+}
+
+# --- Benchmarks ---
+# Each entry maps a name to a function building the list of zero-argument
+# calls to time for a corpus.
+
+def _calc_fu_calls(corpus):
+    calc = ScoreCalculator()
+    calls = []
+    for hand14, _ in corpus:
+        structures = decompose_hand(hand14)
+        if structures:
+            struct = structures[0]
+            win = hand14[-1]
+            calls.append(lambda s=struct, w=win: calc.calculate_fu(s, w, False, True))
+    return calls
+
+BENCHMARKS = {
+    '_parse_hand': lambda corpus: [lambda h=h: _parse_hand(h) for h, _ in corpus],
+    'validate_packet_structure': lambda corpus: [lambda h=h: validate_packet_structure(h) for h, _ in corpus],
+    'decompose_hand': lambda corpus: [lambda h=h: decompose_hand(h) for h, _ in corpus],
+    'check_protocol_readiness': lambda corpus: [lambda h=h: check_protocol_readiness(h) for _, h in corpus],
+    'check_discard_for_tenpai': lambda corpus: [lambda h=h: check_discard_for_tenpai(h) for h, _ in corpus],
+    'YakuChecker.execute': lambda corpus: [
+        lambda h=h: YakuChecker(h, win_tile=h[-1], is_tsumo=True).execute() for h, _ in corpus
+    ],
+    'ScoreCalculator.calculate_fu': _calc_fu_calls,
+}
+
+def run_benchmarks(size, repeat, seed, only=None, warm=False):
+    results = []
+    for corpus_name, build in CORPORA.items():
+        corpus = build(random.Random(f"{seed}:{corpus_name}"), size)
+        for bench_name, make_calls in BENCHMARKS.items():
+            if only and bench_name not in only:
+                continue
+            calls = make_calls(corpus)
+            if not calls:
+                continue
+            timings = []
+            if warm:
+                # One untimed pass fills the cache
+                for call in calls:
+                    call()
+            for _ in range(repeat):
+                if not warm:
+                    clear_decompose_cache()
+                start = time.perf_counter()
+                for call in calls:
+                    call()
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            results.append({
+                'bench': bench_name,
+                'corpus': corpus_name,
+                'cache': 'warm' if warm else 'cold',
+                'calls': len(calls),
+                'best_s': best,
+                'per_call_us': best / len(calls) * 1e6,
+            })
+            print(f"{bench_name:32} {corpus_name:12} {best / len(calls) * 1e6:12.2f} us/call")
+    return results
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(results, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    old = {(r['bench'], r['corpus']): r['per_call_us'] for r in previous['results']}
+    print(f"\nComparison against {previous_path} (new / old):")
+    for r in results:
+        key = (r['bench'], r['corpus'])
+        if key in old and old[key] > 0:
+            print(f"{r['bench']:32} {r['corpus']:12} {r['per_call_us'] / old[key]:8.2f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rule engine benchmarks")
+    parser.add_argument("--out", default="bench_output.json", help="JSON results file")
+    parser.add_argument("--size", type=int, default=200, help="hands per corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (best is kept)")
+    parser.add_argument("--seed", type=int, default=2024, help="corpus seed")
+    parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    parser.add_argument("--warm", action="store_true",
+                        help="keep the decomposition cache across repeats")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.size, args.repeat, args.seed, args.only, args.warm)
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'size': args.size,
+            'repeat': args.repeat,
+            'cache': 'warm' if args.warm else 'cold',
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
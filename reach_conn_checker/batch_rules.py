@@ -0,0 +1,168 @@
+"""
+batch_rules.py
+
+Vectorised packet validation for offline analysis.
+Applies the semantics of validate_packet_structure and
+check_protocol_readiness to whole arrays of hands at once.
+
+Hands are given as an (N, 34) count matrix using the slot layout of
+tiles.py. Each suit is resolved through the same decomposition table as
+the scalar path, expanded into a dense array indexed by the base-5
+suit signature. Rows holding 5+ copies of a tile fall outside the table
+and are checked one by one with the scalar reference path, so results
+match the scalar functions exactly.
+
+Requires NumPy (pip install reach-conn-checker[batch]).
+"""
+
+import numpy as np
+
+from .network_rules import _get_suit_table, _check_agari_counts
+
+# Digit weights of the base-5 suit signature (see network_rules._suit_signature)
+_POWERS = 5 ** np.arange(9, dtype=np.int64)
+
+# Rows processed per step; bounds the size of temporary arrays
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+_SUIT_LOOKUP = None
+
+def _get_suit_lookup():
+    """
+    Dense version of the suit decomposition table.
+    Index: base-5 signature. Value: 0 = not decomposable,
+    1 = melds only, 2 = melds + the pair.
+    """
+    global _SUIT_LOOKUP
+    if _SUIT_LOOKUP is None:
+        table = _get_suit_table()
+        lookup = np.zeros(5 ** 9, dtype=np.uint8)
+        keys = np.fromiter(table.keys(), dtype=np.int64, count=len(table))
+        values = np.fromiter(table.values(), dtype=np.uint8, count=len(table))
+        lookup[keys] = values + 1
+        _SUIT_LOOKUP = lookup
+    return _SUIT_LOOKUP
+
+def _as_count_matrix(counts):
+    counts = np.asarray(counts)
+    if counts.ndim != 2 or counts.shape[1] != 34:
+        raise ValueError(f"expected an (N, 34) count matrix, got shape {counts.shape}")
+    return counts.astype(np.uint8, copy=False)
+
+def _suit_keys(counts):
+    """Base-5 signatures of the three suits, shape (N, 3)."""
+    keys = np.empty((counts.shape[0], 3), dtype=np.int64)
+    for k in range(3):
+        keys[:, k] = counts[:, k * 9:k * 9 + 9].astype(np.int64) @ _POWERS
+    return keys
+
+def _agari_from_parts(suit_flags, honor_ok, honor_pairs, twos, zeros):
+    """Combines per-block results into the Agari flag (standard or Seven Pairs)."""
+    suits_ok = np.all(suit_flags > 0, axis=1)
+    pairs = np.sum(suit_flags == 2, axis=1) + honor_pairs
+    standard = suits_ok & honor_ok & (pairs == 1)
+    chitoi = (twos == 7) & (zeros == 27)
+    return standard | chitoi
+
+def validate_packet_batch(counts, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Batched validate_packet_structure.
+
+    Args:
+        counts (array-like): (N, 34) tile counts per hand.
+        chunk_size (int): Rows processed per step.
+
+    Returns:
+        numpy.ndarray: (N,) bool, True where the hand is Agari.
+    """
+    counts = _as_count_matrix(counts)
+    result = np.zeros(counts.shape[0], dtype=bool)
+    for start in range(0, counts.shape[0], chunk_size):
+        chunk = counts[start:start + chunk_size]
+        result[start:start + chunk_size] = _validate_chunk(chunk)
+    return result
+
+def _validate_chunk(counts):
+    lookup = _get_suit_lookup()
+    size_ok = counts.sum(axis=1, dtype=np.int64) == 14
+    overflow = np.any(counts > 4, axis=1)
+
+    suit_flags = lookup[_suit_keys(np.minimum(counts, 4))]
+    honors = counts[:, 27:]
+    honor_ok = np.all((honors == 0) | (honors == 2) | (honors == 3), axis=1)
+    honor_pairs = np.sum(honors == 2, axis=1)
+    twos = np.sum(counts == 2, axis=1)
+    zeros = np.sum(counts == 0, axis=1)
+
+    agari = _agari_from_parts(suit_flags, honor_ok, honor_pairs, twos, zeros) & size_ok
+
+    # 5+ copies: outside the table, defer to the scalar path
+    for row in np.nonzero(overflow & size_ok)[0]:
+        agari[row] = _check_agari_counts(counts[row].tolist())
+    return agari
+
+def check_readiness_batch(counts, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Batched check_protocol_readiness.
+
+    Args:
+        counts (array-like): (N, 34) tile counts per 13-tile hand.
+        chunk_size (int): Rows processed per step.
+
+    Returns:
+        tuple: ((N,) bool Tenpai flags, (N, 34) bool wait mask)
+    """
+    counts = _as_count_matrix(counts)
+    waits = np.zeros(counts.shape, dtype=bool)
+    for start in range(0, counts.shape[0], chunk_size):
+        chunk = counts[start:start + chunk_size]
+        waits[start:start + chunk_size] = _readiness_chunk(chunk)
+    return waits.any(axis=1), waits
+
+def _readiness_chunk(counts):
+    lookup = _get_suit_lookup()
+    n = counts.shape[0]
+    size_ok = counts.sum(axis=1, dtype=np.int64) == 13
+    overflow = np.any(counts > 4, axis=1)
+    clipped = np.minimum(counts, 4)
+
+    keys = _suit_keys(clipped)
+    suit_flags = lookup[keys]
+    honors = clipped[:, 27:]
+    honor_bad = np.sum((honors == 1) | (honors == 4), axis=1)
+    honor_pairs = np.sum(honors == 2, axis=1)
+    twos = np.sum(clipped == 2, axis=1)
+    zeros = np.sum(clipped == 0, axis=1)
+
+    waits = np.zeros((n, 34), dtype=bool)
+    for slot in range(34):
+        c = clipped[:, slot]
+        # Adding one copy moves the slot from count c to c + 1
+        new_twos = twos - (c == 2) + (c == 1)
+        new_zeros = zeros - (c == 0)
+
+        if slot < 27:
+            k = slot // 9
+            flags = suit_flags.copy()
+            new_keys = np.minimum(keys[:, k] + _POWERS[slot % 9], 5 ** 9 - 1)
+            flags[:, k] = lookup[new_keys]
+            waits[:, slot] = _agari_from_parts(
+                flags, honor_bad == 0, honor_pairs, new_twos, new_zeros)
+        else:
+            was_bad = (c == 1) | (c == 4)
+            now_bad = (c == 0) | (c == 3)
+            new_bad = honor_bad - was_bad + now_bad
+            new_pairs = honor_pairs - (c == 2) + (c == 1)
+            waits[:, slot] = _agari_from_parts(
+                suit_flags, new_bad == 0, new_pairs, new_twos, new_zeros)
+
+    waits &= size_ok[:, None]
+
+    # Reaching 5 copies (or starting above 4) leaves the table: scalar path
+    fallback = (counts >= 4) | overflow[:, None]
+    fallback &= size_ok[:, None]
+    for row, slot in zip(*np.nonzero(fallback)):
+        test = counts[row].tolist()
+        test[slot] += 1
+        waits[row, slot] = _check_agari_counts(test)
+    return waits
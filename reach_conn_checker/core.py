@@ -1,29 +1,10 @@
 
-import random
+import asyncio
 import time
 
-# 麻雀牌をシステムログ風のコードに変換する辞書
-# ここでは例として数牌の一部のみ定義しています
-TILE_MAP = {
-    # Manzu (1m - 9m)
-    "1m": "ADDR_10", "2m": "ADDR_11", "3m": "ADDR_12",
-    "4m": "ADDR_13", "5m": "ADDR_14", "6m": "ADDR_15",
-    "7m": "ADDR_16", "8m": "ADDR_17", "9m": "ADDR_18",
-    
-    # Pinzu (1p - 9p)
-    "1p": "PROC_20", "2p": "PROC_21", "3p": "PROC_22",
-    "4p": "PROC_23", "5p": "PROC_24", "6p": "PROC_25",
-    "7p": "PROC_26", "8p": "PROC_27", "9p": "PROC_28",
-    
-    # Souzu (1s - 9s)
-    "1s": "THRD_30", "2s": "THRD_31", "3s": "THRD_32",
-    "4s": "THRD_33", "5s": "THRD_34", "6s": "THRD_35",
-    "7s": "THRD_36", "8s": "THRD_37", "9s": "THRD_38",
-    
-    # Honors
-    "east": "HOST_E", "south": "HOST_S", "west": "HOST_W", "north": "HOST_N",
-    "white": "[NULL]", "green": "[G_O_F]", "red": "[R_E_D]"
-}
+# Display codes live with the tile registry; re-exported for existing imports
+from .tiles import TILE_MAP, SortedHand, tile_sort_key, tile_code
+from .wall import Wall
 
 class ConnectionManager:
     """
@@ -32,33 +13,46 @@ class ConnectionManager:
     """
     Manages the 'connection' (Game State).
     """
-    def __init__(self):
+    def __init__(self, seed=None, wall=None):
+        """
+        Args:
+            seed: Seed of the wall shuffle; the same seed deals the same session.
+            wall (Wall): Prebuilt wall to use instead.
+        """
         self.melds = [] # Open melds (e.g. ['koutsu', [1,1,1]])
         self.is_reach = False # Reach flag
         self.is_continuous = False # Auto mode flag
         
-        # Initialize Full Deck
-        # 4 of each tile in TILE_MAP (except EAST/SOUTH... we need all 34 types * 4)
-        # TILE_MAP is incomplete in the snippet? 
-        # Actually TILE_MAP is just for display.
-        # We need a proper full deck generator.
-        # 1-9 m,p,s + 7 honors.
-        self.deck = []
-        suffixes = ['m', 'p', 's']
-        honors = ['east', 'south', 'west', 'north', 'white', 'green', 'red']
-        
-        for s in suffixes:
-            for n in range(1, 10):
-                 self.deck.extend([f"{n}{s}"] * 4)
-        for h in honors:
-            self.deck.extend([h] * 4)
-            
-        random.shuffle(self.deck)
+        # Full wall: 4 of each of the 34 tile types, as a compact seeded Wall
+        self.deck = wall if wall is not None else Wall(seed=seed)
         
         # Deal initial hand (13 tiles)
-        self.hand = []
-        for _ in range(13):
-             if self.deck: self.hand.append(self.deck.pop())
+        self.hand = [self.deck.pop() for _ in range(min(13, len(self.deck)))]
+
+    @property
+    def deck(self):
+        """The Wall tiles are drawn from (assigning a tile list wraps it)."""
+        return self._deck
+
+    @deck.setter
+    def deck(self, tiles):
+        self._deck = tiles if isinstance(tiles, Wall) else Wall.from_tiles(tiles)
+
+    @property
+    def hand(self):
+        """The hand as an always-sorted SortedHand (index = display index)."""
+        return self._hand
+
+    @hand.setter
+    def hand(self, tiles):
+        self._hand = tiles if isinstance(tiles, SortedHand) else SortedHand(tiles)
+        self.last_drawn = None # Tile most recently added to the hand
+
+        # Cached analysis of the current hand.
+        # Only valid while the hand is changed through draw/add_tile/discard.
+        self._readiness = None      # (is_tenpai, wait_tiles) for 13 tiles
+        self._discard_waits = None  # {discard: wait_tiles} for 14 tiles
+        self._held_readiness = None # (drawn_tile, readiness) across a draw
     
     
     def _sort_key(self, tile):
@@ -66,46 +60,49 @@ class ConnectionManager:
         Sort key for proper 'Riipai' (sorting).
         Order: Manzu -> Pinzu -> Souzu -> Winds -> Dragons
         """
-        if tile == "unknown": return 999
-        
-        # Suffix priority: m=0, p=1, s=2
-        if tile[-1] in 'mps':
-            suit_order = {'m': 0, 'p': 100, 's': 200}
-            suit = tile[-1]
-            num = int(tile[:-1])
-            return suit_order[suit] + num
-            
-        # Honors
-        honor_order = {
-            "east": 301, "south": 302, "west": 303, "north": 304,
-            "white": 401, "green": 402, "red": 403
-        }
-        return honor_order.get(tile, 900)
+        return tile_sort_key(tile)
 
     def get_hand(self):
-        return sorted(self.hand, key=self._sort_key)
+        """The hand in display order. Read-only: change it through draw/discard."""
+        return self._hand
 
     def discard(self, display_index):
         """
         Discards a tile based on the displayed (sorted) index.
         """
-        sorted_hand = self.get_hand()
-        if 0 <= display_index < len(sorted_hand):
-            tile_to_discard = sorted_hand[display_index]
-            
-            # Remove from internal hand
-            # Use strict remove. If fails, it means inconsistency.
-            try:
-                self.hand.remove(tile_to_discard)
-                return tile_to_discard
-            except ValueError:
-                # Should be impossible if sorted_hand comes from self.hand
-                # But adding debug print just in case
-                print(f"DEBUG_ERROR: Failed to remove {tile_to_discard} from hand {self.hand}")
-                return None
+        if 0 <= display_index < len(self._hand):
+            tile_to_discard = self._hand.pop(display_index)
+            self._after_discard(tile_to_discard)
+            return tile_to_discard
                 
         return None
 
+    def discard_tile(self, tile):
+        """Discards a specific tile (e.g. the auto-forwarded draw during Reach)."""
+        self.hand.remove(tile)
+        self._after_discard(tile)
+        return tile
+
+    def _after_discard(self, tile):
+        self.last_drawn = None
+        held = self._held_readiness
+        self._held_readiness = None
+        if held is not None and held[0] == tile:
+            # Discarding the tile just added restores the previous hand
+            self._readiness = held[1]
+        # A 14-tile analysis already knows the waits left by every discard
+        elif self._discard_waits is not None and len(self.hand) == 13:
+            waits = self._discard_waits.get(tile)
+            self._readiness = (True, waits) if waits else (False, [])
+        else:
+            self._readiness = None
+        self._discard_waits = None
+
+    def _invalidate_analysis(self):
+        self._readiness = None
+        self._discard_waits = None
+        self._held_readiness = None
+
     def draw_tile(self):
         """Draws a tile from the shared deck."""
         if not self.deck: return None
@@ -119,9 +116,20 @@ class ConnectionManager:
         
         tile = self.draw_tile()
         if tile:
-             self.hand.append(tile)
+             self.add_tile(tile)
         return tile
 
+    def add_tile(self, tile):
+        """Adds a tile obtained elsewhere (draw_tile, or a captured discard)."""
+        readiness = self._readiness if len(self.hand) == 13 else None
+        self.hand.add(tile)
+        self.last_drawn = tile
+        self._invalidate_analysis()
+        # Kept until the next discard: dropping the same tile (e.g. the
+        # auto-forwarded draw during Reach) leaves the waits unchanged
+        if readiness is not None:
+            self._held_readiness = (tile, readiness)
+
     def check_connection_stability(self):
         """
         Runs a deep packet inspection to verify connection stability.
@@ -133,24 +141,49 @@ class ConnectionManager:
     def check_readiness(self):
         """
         Checks if connection is ready for continuous monitoring (Reach/Tenpai).
+        The result is cached until the hand changes.
         """
         from .network_rules import check_protocol_readiness
-        return check_protocol_readiness(self.hand)
+        if self._readiness is None:
+            self._readiness = check_protocol_readiness(self.hand)
+        is_tenpai, wait_tiles = self._readiness
+        return is_tenpai, list(wait_tiles)
 
     def check_reachability(self):
         """
         For 14-tile hand: Checks which discard leads to Tenpai.
         Returns list of valid discards for Reach.
+        The result is cached until the hand changes.
         """
-        from .network_rules import check_discard_for_tenpai
-        return check_discard_for_tenpai(self.hand)
+        from .network_rules import map_tenpai_discards
+        if self._discard_waits is None:
+            self._discard_waits = map_tenpai_discards(self.hand)
+        return sorted(self._discard_waits)
+
+    def prime_reach_discards(self, discard_waits):
+        """
+        Installs a map_tenpai_discards result for the current hand computed
+        elsewhere (e.g. speculatively), so check_reachability is a lookup.
+        """
+        if len(self.hand) == 14:
+            self._discard_waits = discard_waits
 
     def get_code(self, tile):
-        return TILE_MAP.get(tile, "UNKNOWN")
+        return tile_code(tile)
 
-def print_fake_log(message):
-    """ 現在時刻付きのログメッセージを表示する """
+FAKE_LOG_DELAY = 0.1 # 処理してる感を出すためのウェイト
+
+def _fake_log_line(message):
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     # 'INFO' というそれっぽいプレフィックスをつける
-    print(f"[{timestamp}] [INFO] {message}")
-    time.sleep(0.1) # 処理してる感を出すためのウェイト
+    return f"[{timestamp}] [INFO] {message}"
+
+def print_fake_log(message):
+    """ 現在時刻付きのログメッセージを表示する """
+    print(_fake_log_line(message))
+    time.sleep(FAKE_LOG_DELAY)
+
+async def print_fake_log_async(message):
+    """ print_fake_log のイベントループを止めない版 """
+    print(_fake_log_line(message))
+    await asyncio.sleep(FAKE_LOG_DELAY)
@@ -1,23 +1,34 @@
 import random
-from .network_rules import check_protocol_readiness, _parse_hand
+from .network_rules import check_protocol_readiness
+from .tiles import SortedHand
 
 class CpuAgent:
-    def __init__(self, tiles=None):
+    def __init__(self, tiles=None, rng=None):
         self.hand = tiles if tiles else []
+        # Source of the discard choices; pass a seeded Random to replay a session
+        self.rng = rng if rng else random.Random()
         self.latest_discard = None
         self.is_reach = False
 
+    @property
+    def hand(self):
+        """The hand as an always-sorted SortedHand."""
+        return self._hand
+
+    @hand.setter
+    def hand(self, tiles):
+        self._hand = tiles if isinstance(tiles, SortedHand) else SortedHand(tiles)
+        # Cached wait tiles of the 13-tile hand (None = not computed).
+        # Only valid while the hand is changed through draw/discard.
+        self._waits = None
+
     def initialize_hand(self, all_tiles):
         """Draws 13 tiles from the deck."""
-        self.hand = []
-        for _ in range(13):
-            if not all_tiles: break
-            self.hand.append(all_tiles.pop())
-        self.sort_hand()
+        self.hand = [all_tiles.pop() for _ in range(min(13, len(all_tiles)))]
 
     def draw(self, tile):
-        self.hand.append(tile)
-        self.sort_hand()
+        self.hand.add(tile)
+        self._waits = None
         # Auto-Reach Check? Could be added here.
 
     def discard(self):
@@ -36,47 +47,35 @@ class CpuAgent:
         # But we sort hand... we need to track drawn tile.
         # For simplicity in this version, let's just pick one randomly.
         
-        discard_index = random.randint(0, len(self.hand) - 1)
+        discard_index = self.rng.randint(0, len(self.hand) - 1)
         discard_tile = self.hand.pop(discard_index)
         self.latest_discard = discard_tile
-        self.sort_hand()
+        self._waits = None
         return discard_tile
 
     def can_ron(self, tile_str):
         """Checks if the CPU can Ron on the given tile."""
-        # Check if adding this tile makes a complete hand
-        temp_hand = self.hand + [tile_str]
-        
-        # We need a strict Agari check, not just Tenpai.
-        # "check_protocol_readiness" returns (is_tenpai, wait_tiles).
-        # Agari means: check_protocol_readiness on 14 tiles returns... wait?
-        # No, check_protocol_readiness is for 13 tiles checking if Tenpai.
-        # For 14 tiles (Agari), we can use "decompose_hand" logic from yaku_rules 
-        # but that handles decomposition.
-        # Or simpler:
-        # If we have 13 tiles, adding 'tile_str' makes 14.
-        # If we treat it as 14 tiles, does it decompose into 4 melds + 1 pair?
-        # Let's use `yaku_rules` decompose if possible, or re-use `check_protocol_readiness`.
-        
-        # `check_protocol_readiness` checks if 13 tiles are waiting for something.
         # If "tile_str" is in the wait list of the current 13-tile hand, then it's Agari!
-        
-        is_tenpai, wait_tiles = check_protocol_readiness(self.hand)
-        if is_tenpai and tile_str in wait_tiles:
-            return True
-            
-        return False
+        return tile_str in self.wait_tiles()
+
+    def wait_tiles(self):
+        """
+        Wait tiles of the current hand as a frozenset.
+        Computed once per hand: the hand does not change between the CPU
+        discard and the next player discard.
+        """
+        if self._waits is None:
+            is_tenpai, wait_tiles = check_protocol_readiness(self.hand)
+            self._waits = frozenset(wait_tiles) if is_tenpai else frozenset()
+        return self._waits
+
+    def prime_waits(self, waits):
+        """Installs wait tiles of the current hand computed elsewhere."""
+        if len(self.hand) == 13:
+            self._waits = frozenset(waits)
 
     def check_tsumo(self):
         """Checks if the current 14-tile hand is Agari (Tsumo)."""
         from .network_rules import validate_packet_structure
         if len(self.hand) != 14: return False
         return validate_packet_structure(self.hand)
-
-    def sort_hand(self):
-        # Sort based on internal int value
-        # This helps CPU logic later
-        try:
-            self.hand.sort(key=lambda x: _parse_hand([x])[0])
-        except:
-            pass # Fallback if parsing fails
@@ -0,0 +1,420 @@
+"""
+engine.py
+
+Turn logic for a 1on1 session, independent of the terminal UI.
+
+GameEngine drives the local host (ConnectionManager) against the remote
+host (CpuAgent). All output goes through an interface object and all
+decisions of the local host come from a player agent, so the same rules
+run under curses (cli.run_session: cli.AsyncHumanPlayer +
+tui.CursesInterface on an asyncio loop) or headless (AutoPlayer +
+NullInterface) at full CPU speed.
+
+Player agents implement:
+    choose_ron(engine, tile) -> bool   Capture the remote discard?
+    next_command(engine) -> str        Command for the turn ('ping 3', 'sudo', ...)
+    acknowledge(engine)                Called before the session ends.
+
+The turn logic is a generator that yields these decisions and the pacing
+pauses as effects. run() carries them out synchronously; run_async()
+awaits them, so agents may return awaitables and pauses become timers
+(interface.pause_async) that leave the event loop free for input.
+"""
+
+import inspect
+import random
+
+from .core import ConnectionManager
+from .wall import Wall
+from .cpu import CpuAgent
+from .yaku_rules import YakuChecker
+from .score_counter import ScoreCalculator
+from .network_rules import validate_packet_structure
+
+def check_agari(manager, win_tile, is_tsumo):
+    is_menzen = (len(manager.melds) == 0)
+    checker = YakuChecker(manager.hand, win_tile, is_tsumo=is_tsumo,
+                          is_reach=manager.is_reach, is_menzen=is_menzen)
+    return checker.has_yaku()
+
+def check_reach_possible(manager):
+    if manager.melds: return False
+    valid_discards = manager.check_reachability()
+    return len(valid_discards) > 0
+
+def check_ron_opportunity(manager, tile):
+    if len(manager.hand) != 13: return False
+    temp_hand = manager.hand.with_tile(tile)
+    is_menzen = (len(manager.melds) == 0)
+    checker = YakuChecker(temp_hand, win_tile=tile, is_tsumo=False,
+                          is_reach=manager.is_reach, is_menzen=is_menzen)
+    return checker.has_yaku()
+
+def score_hand(hand, win_tile, is_tsumo, is_menzen=True, is_reach=False, is_oya=False):
+    """
+    Runs the Yaku check and the score calculation for a finished hand.
+    Returns the YakuChecker result (which carries the real 'fu') extended
+    with the ScoreCalculator result under 'score'.
+    """
+    checker = YakuChecker(hand, win_tile, is_tsumo=is_tsumo, is_reach=is_reach, is_menzen=is_menzen)
+    res = checker.execute()
+
+    calc = ScoreCalculator()
+    res['score'] = calc.calculate_score(res['han'], res['fu'], is_oya=is_oya, is_tsumo=is_tsumo)
+    return res
+
+def _derived_rng(seed, stream):
+    """Independent Random per stream of a session seed (unseeded if None)."""
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}:{stream}")
+
+class NullInterface:
+    """Interface that drops all output. Used for headless runs."""
+    def log(self, message, color_pair_idx=1):
+        pass
+
+    def update_status(self, manager, cpu_agent=None, latency_check=False):
+        pass
+
+    def refresh(self):
+        pass
+
+    def pause(self, seconds):
+        pass
+
+class AutoPlayer:
+    """
+    Player agent for headless runs.
+    Wins whenever possible, declares Reach when Tenpai (optional) and
+    otherwise discards at random, like CpuAgent.
+    """
+    def __init__(self, rng=None, use_reach=True):
+        self.rng = rng if rng else random.Random()
+        self.use_reach = use_reach
+
+    def choose_ron(self, engine, tile):
+        return True
+
+    def next_command(self, engine):
+        manager = engine.manager
+        if validate_packet_structure(manager.hand) and check_agari(manager, manager.last_drawn, is_tsumo=True):
+            return "sudo"
+        if manager.is_reach:
+            # Reach was just declared: drop a tile that keeps Tenpai
+            tile = self.rng.choice(manager.check_reachability())
+            return f"ping {manager.get_hand().index(tile)}"
+        if self.use_reach and check_reach_possible(manager):
+            return "ping -t"
+        return f"ping {self.rng.randrange(len(manager.hand))}"
+
+    def acknowledge(self, engine):
+        pass
+
+class CpuPlayer:
+    """
+    Player agent backed by a CpuAgent, for CpuAgent-vs-CpuAgent runs.
+    The agent is given the local hand before each decision, so the local
+    host plays exactly the CpuAgent policy: Ron and Tsumo whenever the hand
+    allows, otherwise the agent's discard choice.
+    """
+    def __init__(self, agent=None, rng=None):
+        self.agent = agent if agent else CpuAgent(rng=rng)
+
+    def choose_ron(self, engine, tile):
+        return True
+
+    def next_command(self, engine):
+        manager = engine.manager
+        agent = self.agent
+        agent.hand = manager.hand.copy()
+        if agent.check_tsumo() and check_agari(manager, manager.last_drawn, is_tsumo=True):
+            return "sudo"
+        tile = agent.discard()
+        return f"ping {manager.get_hand().index(tile)}"
+
+    def acknowledge(self, engine):
+        pass
+
+class GameEngine:
+    """
+    Runs one session between the local host (player agent) and the
+    remote host (CPU agent).
+    """
+    def __init__(self, player, cpu=None, interface=None, manager=None, seed=None):
+        """
+        seed: When given, the wall and the CPU discards not passed in are
+        derived from it, so the same seed and player replay the same session.
+        """
+        self.player = player
+        self.cpu = cpu if cpu else CpuAgent(rng=_derived_rng(seed, "cpu"))
+        self.interface = interface if interface else NullInterface()
+        self.manager = manager if manager else ConnectionManager(wall=Wall(rng=_derived_rng(seed, "wall")))
+        self.turns = 0
+        # Tiles the local host is waiting on; only these can be a Ron
+        self.player_waits = frozenset()
+
+    def _result(self, winner=None, win_type=None, win_tile=None, score=None, aborted=False):
+        """
+        Builds the session summary.
+        winner: 'player', 'cpu' or None (exhausted deck / aborted).
+        win_type: 'ron' or 'tsumo'.
+        """
+        return {
+            'winner': winner,
+            'win_type': win_type,
+            'win_tile': win_tile,
+            'turns': self.turns,
+            'han': score['han'] if score else 0,
+            'fu': score['fu'] if score else 0,
+            'points': score['score']['total'] if score else 0,
+            'yaku': score['yaku'] if score else [],
+            'aborted': aborted,
+        }
+
+    def _display_result(self, res):
+        interface = self.interface
+        interface.log("\n=== CONNECTION REPORT ===", 2)
+        interface.log(f"Status: ESTABLISHED ({res['score_name'] or 'Agari'})", 2)
+        interface.log("Protocol Standards (Yaku):")
+        for y in res['yaku']:
+            interface.log(f"  * {y}")
+
+        interface.log(f"\nComplexity Overhead: {res['fu']} Fu")
+        interface.log(f"Total Latency Impact: {res['han']} Han")
+        interface.log("Traffic Load Analysis")
+        interface.log(f"  TOTAL: {res['score']['total']} packets")
+        interface.log(f"  PAYLOAD: {res['score']['payments']}")
+        interface.log("=========================", 2)
+
+        interface.refresh()
+        # Wait for user acknowledgment
+        interface.log("Press Enter to exit...")
+        yield ("acknowledge", ())
+
+    def _player_wins(self, win_tile, is_tsumo):
+        manager = self.manager
+        res = score_hand(manager.hand, win_tile, is_tsumo, is_menzen=(len(manager.melds) == 0),
+                         is_reach=manager.is_reach)
+        yield from self._display_result(res)
+        return self._result('player', 'tsumo' if is_tsumo else 'ron', win_tile, res)
+
+    def _cpu_wins(self, win_tile, is_tsumo):
+        hand = self.cpu.hand if is_tsumo else self.cpu.hand.with_tile(win_tile)
+        res = score_hand(hand, win_tile, is_tsumo, is_reach=self.cpu.is_reach)
+        yield ("acknowledge", ())
+        return self._result('cpu', 'tsumo' if is_tsumo else 'ron', win_tile, res)
+
+    def _timed_out(self):
+        self.interface.log("Connection timed out (No more packets).", 4)
+        yield ("acknowledge", ())
+        return self._result()
+
+    def _update_player_waits(self):
+        """Refreshes player_waits from the (cached) readiness of the hand."""
+        manager = self.manager
+        if len(manager.hand) == 13:
+            self.player_waits = frozenset(manager.check_readiness()[1])
+        else:
+            self.player_waits = frozenset()
+
+    def setup(self):
+        # Initialize CPU Hand
+        for _ in range(13):
+            if self.manager.deck:
+                t = self.manager.deck.pop()
+                self.cpu.draw(t)
+
+    def run(self):
+        """Plays the session to the end and returns the summary dict."""
+        session = self._session()
+        reply = None
+        try:
+            while True:
+                reply = self._perform(session.send(reply))
+        except StopIteration as stop:
+            return stop.value
+
+    async def run_async(self):
+        """
+        run() for an asyncio event loop. Agent calls returning an awaitable
+        are awaited, and pauses use interface.pause_async when available,
+        so input can be handled while the session waits.
+        """
+        session = self._session()
+        reply = None
+        try:
+            while True:
+                name, args = effect = session.send(reply)
+                pause_async = getattr(self.interface, "pause_async", None)
+                if name == "pause" and pause_async:
+                    reply = await pause_async(*args)
+                    continue
+                reply = self._perform(effect)
+                if inspect.isawaitable(reply):
+                    reply = await reply
+        except StopIteration as stop:
+            return stop.value
+
+    def _perform(self, effect):
+        """Carries out one effect yielded by the session."""
+        name, args = effect
+        if name == "pause":
+            return self.interface.pause(*args)
+        return getattr(self.player, name)(self, *args)
+
+    def _session(self):
+        """
+        Turn logic of the session as a generator. It yields effects, as
+        (player method name or 'pause', args). The reply to each effect is
+        sent back in. It returns the summary dict.
+        """
+        interface = self.interface
+        manager = self.manager
+        cpu = self.cpu
+
+        self.setup()
+        self._update_player_waits()
+
+        interface.log("Target system: 192.168.1.1 (ESTABLISHED)", 1)
+        interface.log("Monitoring traffic... (Type 'help' for commands)", 1)
+
+        interface.update_status(manager, cpu)
+        interface.refresh()
+
+        while True:
+            # --- PLAYER TURN ---
+            player_discarded_tile = None
+
+            # 1. Check Player Ron on CPU's last discard
+            # Non-waits are rejected before any Yaku evaluation
+            if cpu.latest_discard in self.player_waits:
+                if check_ron_opportunity(manager, cpu.latest_discard):
+                    interface.log(f"!!! OPPORTUNITY: Remote packet {cpu.latest_discard} matches signature! !!!", 3)
+                    interface.log("Type 'sudo' to capture (Ron) or Enter to ignore.", 3)
+
+                    if (yield ("choose_ron", (cpu.latest_discard,))):
+                        manager.add_tile(cpu.latest_discard)
+                        return (yield from self._player_wins(cpu.latest_discard, is_tsumo=False))
+                    else:
+                        interface.log("Packet ignored.")
+
+            # 2. Draw Tile
+            drawn = None
+            if len(manager.hand) < 14:
+                if not manager.deck:
+                    return (yield from self._timed_out())
+                drawn = manager.draw()
+                self.turns += 1
+                interface.update_status(manager, cpu) # Update HUD
+                interface.log(f"Incoming packet: {drawn}")
+
+                # Check Tsumo (Agari)
+                if manager.is_reach:
+                     yield ("pause", (1,))
+                     if check_agari(manager, drawn, is_tsumo=True):
+                         interface.log("!!! DETECTED PROTOCOL COMPLIANCE (TSUMO) !!!", 2)
+                         return (yield from self._player_wins(drawn, is_tsumo=True))
+                     else:
+                         interface.log(f"Auto-forwarding packet: {drawn}")
+                         manager.discard_tile(drawn)
+                         interface.update_status(manager, cpu)
+                         # End Turn handled by loop continuation (skiplayer input)
+
+            if not manager.is_reach and (drawn or len(manager.hand) == 14):
+                interface.update_status(manager, cpu)
+
+                # 3. Input Loop
+                turn_end = False
+
+                while not turn_end:
+                    cmd_str = yield ("next_command", ())
+                    if not cmd_str: continue
+
+                    cmd = cmd_str.split()
+                    op = cmd[0]
+
+                    if op in ["exit", "quit"]:
+                        return self._result(aborted=True)
+                    elif op == "help":
+                        interface.log("Commands: ping <idx> (discard), sudo (agari), reach (declare pending), exit")
+                    elif op == "sudo":
+                        if check_agari(manager, manager.last_drawn, is_tsumo=True):
+                            return (yield from self._player_wins(manager.last_drawn, is_tsumo=True))
+                        else:
+                            interface.log("Error: Hand not compliant (No Agari).", 4)
+                    elif op == "ping": # Discard
+                        if len(cmd) > 1 and cmd[1] == "-t":
+                            if check_reach_possible(manager):
+                               interface.log(f"Warning: Continuous ping initiated. Latency check started.", 3)
+                               manager.is_reach = True
+                               interface.update_status(manager, cpu)
+                               interface.log("Select packet to drop to start continuous ping:")
+                               continue
+                            else:
+                               interface.log("Error: Cannot start continuous ping (Not Tenpai or already Reach).", 4)
+                        elif len(cmd) > 1 and cmd[1].isdigit():
+                            idx = int(cmd[1])
+                            if 0 <= idx < len(manager.hand):
+                               player_discarded_tile = manager.discard(idx)
+                               if player_discarded_tile:
+                                   interface.log(f"Packet forwarded: {player_discarded_tile}")
+                                   turn_end = True
+                               else:
+                                   interface.log("Invalid packet index.", 4)
+                            else:
+                               interface.log("Invalid index.", 4)
+                        else:
+                            interface.log("Usage: ping <index>")
+                    else:
+                        interface.log("Unknown command.")
+
+                interface.update_status(manager, cpu)
+
+            # Draw logic handled above puts drawn tile in hand. If reach, we pop it.
+            # If normal play and we discarded, len is 13.
+            # Check transition to CPU
+            if manager.is_reach and drawn and len(manager.hand) == 13:
+                 player_discarded_tile = drawn # Auto discard
+
+            self._update_player_waits()
+
+            # --- CPU TURN ---
+            interface.log("--- [ REMOTE HOST ACTIONS ] ---", 5)
+            yield ("pause", (0.5,))
+
+            # 1. Check CPU Ron
+            if player_discarded_tile:
+                if cpu.can_ron(player_discarded_tile):
+                     interface.log(f"!!! CPU DETECTED VULNERABILITY (RON) on {player_discarded_tile} !!!", 4)
+                     interface.log("CPU Wins! (Connection Terminated by Remote Host)", 4)
+                     interface.log("Press Enter to exit...")
+                     return (yield from self._cpu_wins(player_discarded_tile, is_tsumo=False))
+
+            # 2. CPU Draw
+            if not manager.deck:
+                 return (yield from self._timed_out())
+            cpu_drawn = manager.deck.pop()
+            cpu.draw(cpu_drawn)
+
+            # 3. CPU Tsumo
+            if cpu.check_tsumo():
+                 interface.log(f"!!! CPU SELF-HOSTED COMPLETE (TSUMO) on {cpu_drawn} !!!", 4)
+                 interface.log("CPU Wins!", 4)
+                 interface.log("Press Enter to exit...")
+                 return (yield from self._cpu_wins(cpu_drawn, is_tsumo=True))
+
+            # 4. CPU Discard
+            cpu_discard = cpu.discard()
+            interface.log(f"Remote host forwarded: {cpu_discard}")
+            interface.refresh()
+
+def play_headless(player=None, cpu=None, manager=None, seed=None):
+    """
+    Plays one session without any UI and returns its summary.
+    With a seed (and a seeded or default player) the session is reproducible.
+    """
+    if player is None:
+        player = AutoPlayer(rng=_derived_rng(seed, "player"))
+    engine = GameEngine(player, cpu=cpu, manager=manager, seed=seed)
+    return engine.run()
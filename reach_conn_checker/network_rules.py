@@ -7,7 +7,10 @@ It ensures that the data traversing the network adheres to the
 expected protocol format (e.g. 4 groups + 1 pair).
 """
 
-from collections import Counter
+from collections import Counter, OrderedDict
+from types import MappingProxyType
+from .tiles import HandCounts, TILE_NAMES, TILE_INTS, TILE_REGISTRY, count_vector
+from .shanten import shanten_from_counts
 
 def _parse_hand(hand):
     """
@@ -19,26 +22,11 @@ def _parse_hand(hand):
     East,South,West,North: 31, 33, 35, 37 (Odd numbers to prevent sequences)
     White,Green,Red: 41, 43, 45 (Odd numbers to prevent sequences)
     """
-    # Simply mapping for internal calculation
-    mapping = {
-        # Manzu
-        "1m": 1, "2m": 2, "3m": 3, "4m": 4, "5m": 5, "6m": 6, "7m": 7, "8m": 8, "9m": 9,
-        # Pinzu
-        "1p": 11, "2p": 12, "3p": 13, "4p": 14, "5p": 15, "6p": 16, "7p": 17, "8p": 18, "9p": 19,
-        # Souzu
-        "1s": 21, "2s": 22, "3s": 23, "4s": 24, "5s": 25, "6s": 26, "7s": 27, "8s": 28, "9s": 29,
-        # Winds (offsets to avoid sequence checks matching them)
-        "east": 31, "south": 33, "west": 35, "north": 37,
-        # Dragons
-        "white": 41, "green": 43, "red": 45
-    }
-    # Reverse mapping for debug logging if needed
-    # reverse_mapping = {v: k for k, v in mapping.items()}
-    
     parsed = []
     for tile in hand:
-        if tile in mapping:
-            parsed.append(mapping[tile])
+        entry = TILE_REGISTRY.get(tile)
+        if entry is not None:
+            parsed.append(entry.int_code)
     return sorted(parsed)
 
 def _is_sequence(a, b, c):
@@ -75,118 +63,255 @@ def _find_solution(tiles):
 
     return False
 
-def _find_all_combinations(tiles):
+def _find_all_combinations(counts, start=0):
     """
-    Recursive backtracking to find ALL valid sets of 4 melds.
-    Returns a list of lists, where each inner list contains 4 melds (tuples).
-    Meld format: (type, tiles) e.g. ('shuntsu', [1, 2, 3]) or ('koutsu', [5, 5, 5])
+    Recursive backtracking over a 34-slot count vector to find ALL valid
+    sets of melds covering the remaining tiles.
+    Returns a list of tuples, where each inner tuple contains melds.
+    Meld format: (type, tiles) e.g. ('shuntsu', (1, 2, 3)) or ('koutsu', (5, 5, 5))
+    Tiles inside melds use the integer codes of _parse_hand.
     """
-    if not tiles:
-        return [[]]
+    # Skip to the first remaining tile
+    while start < 34 and counts[start] == 0:
+        start += 1
+    if start == 34:
+        return [()]
 
     results = []
-    count = Counter(tiles)
-    first = tiles[0]
-    
+    first = TILE_INTS[start]
+
     # Try Koutsu (Triplet)
-    if count[first] >= 3:
-        remaining = tiles[:]
-        meld_tiles = [first, first, first]
-        for _ in range(3):
-            remaining.remove(first)
-        
-        sub_results = _find_all_combinations(remaining)
-        for sub in sub_results:
-            results.append([('koutsu', meld_tiles)] + sub)
+    if counts[start] >= 3:
+        counts[start] -= 3
+        meld = ('koutsu', (first, first, first))
+        for sub in _find_all_combinations(counts, start):
+            results.append((meld,) + sub)
+        counts[start] += 3
+
+    # Try Shuntsu (Sequence) - number tiles 1-7 of each suit only
+    if start < 27 and start % 9 <= 6 and counts[start + 1] and counts[start + 2]:
+        counts[start] -= 1
+        counts[start + 1] -= 1
+        counts[start + 2] -= 1
+        meld = ('shuntsu', (first, first + 1, first + 2))
+        for sub in _find_all_combinations(counts, start):
+            results.append((meld,) + sub)
+        counts[start] += 1
+        counts[start + 1] += 1
+        counts[start + 2] += 1
 
-    # Try Shuntsu (Sequence)
-    if first < 30:
-        if (first + 1) in tiles and (first + 2) in tiles:
-            remaining = tiles[:]
-            meld_tiles = [first, first + 1, first + 2]
-            remaining.remove(first)
-            remaining.remove(first + 1)
-            remaining.remove(first + 2)
-            
-            sub_results = _find_all_combinations(remaining)
-            for sub in sub_results:
-                results.append([('shuntsu', meld_tiles)] + sub)
-                
     return results
 
+class _DecompositionCache:
+    """
+    Bounded LRU cache for decompose_hand, keyed by the hand's count tuple.
+    Cached results are immutable, so they can be shared between callers.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self._entries) > max(maxsize, 0):
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+DECOMPOSE_CACHE_SIZE = 4096
+
+_DECOMPOSE_CACHE = _DecompositionCache(DECOMPOSE_CACHE_SIZE)
+
+def set_decompose_cache_size(maxsize):
+    """Sets the number of hands kept by the decompose_hand cache (0 disables it)."""
+    _DECOMPOSE_CACHE.resize(maxsize)
+
+def decompose_cache_info():
+    """Returns hit/miss counters and the current size of the decompose_hand cache."""
+    return _DECOMPOSE_CACHE.info()
+
+def clear_decompose_cache():
+    """Drops all cached decompositions and resets the counters."""
+    _DECOMPOSE_CACHE.clear()
+
 def decompose_hand(hand_input):
     """
     Analyzes the hand and returns all possible winning structures.
     Used for Yaku and Score calculation.
+    Results are memoized per hand (see set_decompose_cache_size) and
+    are read-only.
     
+    Args:
+        hand_input (list or HandCounts): Tile strings or a count vector.
+
     Returns:
-        list of dict: A list of structural interpretations.
-                      Each dict contains:
+        tuple of mappings: The structural interpretations.
+                      Each mapping contains:
                       - 'type': 'standard' or 'seven_pairs' or 'kokushi'
-                      - 'pair': list of int (the head)
-                      - 'melds': list of tuples (type, tiles)
+                      - 'pair': tuple of int (the head)
+                      - 'melds': tuple of tuples (type, tiles)
     """
     if len(hand_input) != 14:
-        return []
+        return ()
 
-    tiles = _parse_hand(hand_input)
-    unique_tiles = sorted(list(set(tiles)))
+    counts = count_vector(hand_input, copy=True)
+
+    key = tuple(counts)
+    structures = _DECOMPOSE_CACHE.get(key)
+    if structures is None:
+        structures = _decompose_counts(counts)
+        _DECOMPOSE_CACHE.put(key, structures)
+    return structures
+
+def _decompose_counts(counts):
     structures = []
 
     # 1. Seven Pairs (Chii-toitsu)
-    if len(unique_tiles) == 7:
-        is_chitoi = True
-        pairs = []
-        for t in unique_tiles:
-            if tiles.count(t) != 2:
-                is_chitoi = False
-                break
-            pairs.append(t)
-        if is_chitoi:
-            structures.append({
-                'type': 'seven_pairs',
-                'pair': None,
-                'melds': [],
-                'pairs': pairs # Special field for chitoi
-            })
+    if counts.count(2) == 7 and counts.count(0) == 27:
+        structures.append(MappingProxyType({
+            'type': 'seven_pairs',
+            'pair': None,
+            'melds': (),
+            'pairs': tuple(TILE_INTS[i] for i in range(34) if counts[i]) # Special field for chitoi
+        }))
 
     # 2. Standard Form (4 Melds + 1 Pair)
-    for tile in unique_tiles:
-        if tiles.count(tile) >= 2:
-            remaining_tiles = tiles[:]
-            remaining_tiles.remove(tile)
-            remaining_tiles.remove(tile)
+    for index in range(34):
+        if counts[index] >= 2:
+            tile = TILE_INTS[index]
+            counts[index] -= 2
             
             # Find all combinations for the remaining 12 tiles
-            combinations = _find_all_combinations(remaining_tiles)
+            combinations = _find_all_combinations(counts)
+            counts[index] += 2
             for comb in combinations:
                 # Must have exactly 4 melds
                 if len(comb) == 4:
-                    structures.append({
+                    structures.append(MappingProxyType({
                         'type': 'standard',
-                        'pair': [tile, tile],
+                        'pair': (tile, tile),
                         'melds': comb
-                    })
+                    }))
                     
-    return structures
+    return tuple(structures)
 
-def validate_packet_structure(hand_input):
+def _suit_signature(counts, start):
     """
-    Validates if the provided 'packet' (hand) forms a comprehensive structure.
-    A valid structure consists of 4 subgroups (melds) and 1 checksum pair.
-    
-    Args:
-        hand_input (list): List of strings representing the packet segments (tiles).
-                           e.g., ["1m", "2m", "3m", ...]
-    
+    Packs the 9 counts of one suit (counts[start:start + 9]) into a
+    base-5 integer. This is the key used by the suit decomposition table.
+    """
+    key = 0
+    for i in range(start + 8, start - 1, -1):
+        key = key * 5 + counts[i]
+    return key
+
+def _build_suit_table():
+    """
+    Enumerates every way a single suit can be fully split into melds
+    (at most 4) and at most one pair, and records the resulting count
+    signatures.
+
     Returns:
-        bool: True if structure is valid (Agari), False otherwise.
+        dict: signature -> 1 if the suit needs the pair, 0 otherwise.
+              Signatures not in the table cannot be decomposed.
     """
-    if len(hand_input) != 14:
-        # Standard packet size must be 14 segments
-        return False
+    # Meld shapes as offsets into a 9-slot suit: 9 triplets, 7 sequences
+    shapes = [(i, i, i) for i in range(9)] + [(i, i + 1, i + 2) for i in range(7)]
+    table = {}
+    counts = [0] * 9
+
+    def record():
+        table[_suit_signature(counts, 0)] = 0
+        for i in range(9):
+            if counts[i] <= 2:
+                counts[i] += 2
+                table[_suit_signature(counts, 0)] = 1
+                counts[i] -= 2
+
+    def place(first_shape, melds_left):
+        record()
+        if melds_left == 0:
+            return
+        for s in range(first_shape, len(shapes)):
+            shape = shapes[s]
+            for i in shape:
+                counts[i] += 1
+            if max(counts) <= 4:
+                place(s, melds_left - 1)
+            for i in shape:
+                counts[i] -= 1
+
+    place(0, 4)
+    return table
+
+_SUIT_TABLE = None
+
+def _get_suit_table():
+    global _SUIT_TABLE
+    if _SUIT_TABLE is None:
+        _SUIT_TABLE = _build_suit_table()
+    return _SUIT_TABLE
+
+def _is_agari_counts(counts):
+    """
+    Table-driven agari check on a 34-slot count vector.
+    Each suit is resolved with one dict lookup; honors can only form
+    triplets or the pair. Counts above 4 are not covered by the table
+    and must be checked with the reference path instead.
+    """
+    # Seven Pairs (Chii-toitsu): 7 distinct tiles, exactly 2 of each
+    if counts.count(2) == 7 and counts.count(0) == 27:
+        return True
+
+    table = _get_suit_table()
+    pairs = 0
+    for start in (0, 9, 18):
+        needs_pair = table.get(_suit_signature(counts, start))
+        if needs_pair is None:
+            return False
+        pairs += needs_pair
+    for i in range(27, 34):
+        c = counts[i]
+        if c == 2:
+            pairs += 1
+        elif c != 0 and c != 3:
+            return False
+    return pairs == 1
 
-    tiles = _parse_hand(hand_input)
+def _validate_reference(tiles):
+    """
+    Reference agari check by backtracking over a sorted int tile list.
+    Kept as the ground truth for the table-driven path.
+    """
     unique_tiles = sorted(list(set(tiles)))
 
     # Try every possible pair (Head)
@@ -217,6 +342,35 @@ def validate_packet_structure(hand_input):
 
     return False
 
+def validate_packet_structure(hand_input):
+    """
+    Validates if the provided 'packet' (hand) forms a comprehensive structure.
+    A valid structure consists of 4 subgroups (melds) and 1 checksum pair.
+    
+    Args:
+        hand_input (list or HandCounts): List of strings representing the packet
+                           segments (tiles), e.g. ["1m", "2m", "3m", ...],
+                           or the equivalent count vector.
+    
+    Returns:
+        bool: True if structure is valid (Agari), False otherwise.
+    """
+    if len(hand_input) != 14:
+        # Standard packet size must be 14 segments
+        return False
+
+    counts = count_vector(hand_input)
+
+    return _check_agari_counts(counts)
+
+def _check_agari_counts(counts):
+    """Agari check on a count vector, falling back to the reference path if needed."""
+    if max(counts) > 4:
+        # Impossible packet (5+ copies): outside the table, use the slow path
+        return _validate_reference(HandCounts.from_counts(counts).to_ints())
+
+    return _is_agari_counts(counts)
+
 def audit_protocol_compliance(hand_input):
     """
     Checks if the packet complies with specific protocol standards (Yaku).
@@ -231,23 +385,58 @@ def check_discard_for_tenpai(hand_input):
     Checks if a 14-tile hand can become Tenpai by discarding one tile.
     Returns a list of tiles (strings) that lead to Tenpai.
     """
+    return sorted(map_tenpai_discards(hand_input))
+
+def map_tenpai_discards(hand_input):
+    """
+    For a 14-tile hand, maps every discard that leaves the hand Tenpai
+    to the wait tiles (strings) of the resulting 13-tile hand.
+    Returns an empty dict for any other hand size.
+    """
     if len(hand_input) != 14:
-        return []
+        return {}
     
-    tenpai_discards = []
-    unique_tiles = sorted(list(set(hand_input)))
-    
-    for tile_to_discard in unique_tiles:
-        # Create a temporary hand with this tile removed
-        temp_hand = hand_input[:]
-        # We need to remove only one instance of this tile
-        temp_hand.remove(tile_to_discard)
-        
-        is_tenpai, _ = check_protocol_readiness(temp_hand)
-        if is_tenpai:
-            tenpai_discards.append(tile_to_discard)
+    counts = count_vector(hand_input, copy=True)
+
+    discard_waits = {}
+    if shanten_from_counts(counts) > 0:
+        # No single discard can reach Tenpai
+        return discard_waits
+
+    for index in range(34):
+        if not counts[index]:
+            continue
+        # Remove one instance of this tile and look for any wait
+        counts[index] -= 1
+        waits = _find_wait_slots(counts)
+        if waits:
+            discard_waits[TILE_NAMES[index]] = [TILE_NAMES[w] for w in waits]
+        counts[index] += 1
             
-    return tenpai_discards
+    return discard_waits
+
+# A tile can only complete the hand next to something it can group with:
+# itself (pair/triplet) or a tile up to 2 steps away in the same suit.
+_WAIT_NEIGHBOURS = [
+    [n for n in range(index - 2, index + 3) if n // 9 == index // 9 and 0 <= n < 27]
+    if index < 27 else [index]
+    for index in range(34)
+]
+
+def _find_wait_slots(counts):
+    """
+    Returns the slots that complete a 13-tile count vector.
+    The vector is modified during the scan and restored before returning.
+    """
+    waits = []
+    for index in range(34):
+        if not any(counts[n] for n in _WAIT_NEIGHBOURS[index]):
+            continue
+        counts[index] += 1
+        if _check_agari_counts(counts):
+            waits.append(index)
+        counts[index] -= 1
+    return waits
 
 def check_protocol_readiness(hand_input, get_all_tiles_func=None):
     """
@@ -255,7 +444,7 @@ def check_protocol_readiness(hand_input, get_all_tiles_func=None):
     This means if 1 more packet segment is added, verification succeeds.
     
     Args:
-        hand_input (list): Current hand segments.
+        hand_input (list or HandCounts): Current hand segments.
         get_all_tiles_func (callable): Function to get all possible tiles.
                                        If None, uses hardcoded local set.
     """
@@ -263,29 +452,67 @@ def check_protocol_readiness(hand_input, get_all_tiles_func=None):
         # Must be 13 segments to be in Readiness state
         return False, []
 
-    # All possible tiles (34 types)
-    # Manzu: 1m-9m
-    # Pinzu: 1p-9p
-    # Souzu: 1s-9s
-    # Winds: east, south, west, north
-    # Dragons: white, green, red
-    
-    suffixes = ['m', 'p', 's']
-    all_tiles = []
-    for s in suffixes:
-        for i in range(1, 10):
-            all_tiles.append(f"{i}{s}")
-    all_tiles.extend(["east", "south", "west", "north", "white", "green", "red"])
-
-    # Collect all valid waiting tiles
-    wait_tiles = []
-    for tile in all_tiles:
-        test_hand = hand_input[:]
-        test_hand.append(tile)
-        if validate_packet_structure(test_hand):
-            wait_tiles.append(tile)
+    counts = count_vector(hand_input, copy=True)
+
+    if shanten_from_counts(counts) > 0:
+        return False, []
+
+    # Collect all valid waiting tiles (all 34 types)
+    wait_tiles = [TILE_NAMES[index] for index in _find_wait_slots(counts)]
             
     if wait_tiles:
         return True, wait_tiles
             
     return False, []
+
+def check_effective_tiles(hand_input, visible_tiles=None):
+    """
+    Counts the effective tiles (Ukeire) of a hand.
+    An effective tile is one whose draw lowers the shanten number.
+
+    Args:
+        hand_input (list or HandCounts): 13 segments, or 14 segments to
+                                         evaluate every candidate discard.
+        visible_tiles (list or HandCounts): Tiles already seen outside the
+                                            hand (discards etc.). The hand
+                                            itself is always counted as seen.
+
+    Returns:
+        list of dict, best candidate first (lowest shanten, most live tiles).
+        Each dict contains:
+            - 'discard': tile discarded (None for a 13-tile hand)
+            - 'shanten': shanten number after the discard
+            - 'tiles': {tile: live copies} for every effective tile
+            - 'total': total live copies of the effective tiles
+    """
+    from .shanten import improving_draws
+
+    size = len(hand_input)
+    if size not in (13, 14):
+        return []
+
+    counts = count_vector(hand_input, copy=True)
+
+    # Copies still live: 4 minus what the hand and the table already show
+    seen = count_vector(visible_tiles)
+    live = [max(0, 4 - counts[i] - seen[i]) for i in range(34)]
+
+    def evaluate(discard):
+        shanten, draws = improving_draws(counts)
+        effective = {TILE_NAMES[index]: live[index] for index in draws}
+        total = sum(effective.values())
+        return {'discard': discard, 'shanten': shanten, 'tiles': effective, 'total': total}
+
+    if size == 13:
+        return [evaluate(None)]
+
+    results = []
+    for index in range(34):
+        if not counts[index]:
+            continue
+        counts[index] -= 1
+        results.append(evaluate(TILE_NAMES[index]))
+        counts[index] += 1
+
+    results.sort(key=lambda r: (r['shanten'], -r['total']))
+    return results
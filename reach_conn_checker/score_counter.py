@@ -6,7 +6,7 @@ It provides the total points and the breakdown of payment (Ko/Oya).
 """
 
 import math
-from .network_rules import _parse_hand
+from .tiles import tile_to_int
 
 class ScoreCalculator:
     def __init__(self):
@@ -52,11 +52,8 @@ class ScoreCalculator:
         if is_tsumo:
             fu += 2
             
-        # Parse context tiles
-        try:
-            win_tile = _parse_hand([win_tile_str])[0]
-        except:
-            win_tile = 0 # Should not happen
+        # Parse context tiles (0 if unknown, should not happen)
+        win_tile = tile_to_int(win_tile_str)
             
         # Winds mapping
         wind_map = {'east': 31, 'south': 33, 'west': 35, 'north': 37}
@@ -152,50 +149,111 @@ class ScoreCalculator:
         Calculates the final score points.
         Returns dict with keys: 'total', 'payments' (list/str)
         """
-        if han == 0:
-            return {'total': 0, 'payments': '0'}
-            
-        base_points = 0
-        
-        # 1. Determine Basic Points (Base)
-        if han >= 5 or (han >= 4 and fu >= 40) or (han >= 3 and fu >= 70):
-             # Limit Hand (Mangan+)
-             if han >= 13: base_points = 8000
-             elif han >= 11: base_points = 6000
-             elif han >= 8: base_points = 4000
-             elif han >= 6: base_points = 3000
-             else: base_points = 2000
-        else:
-             # Normal Hand
-             base_points = fu * (2 ** (2 + han))
-             # Cap at Mangan
-             if base_points > 2000:
-                 base_points = 2000
-
-        # 2. Calculate Payments
-        # Rounded up to nearest 100
-        def round100(val):
-            return math.ceil(val / 100) * 100
-            
-        info = {}
+        entry = _lookup_score(han, fu, is_oya, is_tsumo)
+        return {'total': entry[0], 'payments': entry[1]}
+
+    def score_batch(self, rows):
+        """
+        Scores many hands in one call.
+
+        Args:
+            rows (iterable): (han, fu, is_oya, is_tsumo) tuples.
+
+        Returns:
+            list of (total, payments) tuples, in input order.
+            Unlike calculate_score, which builds a {'total', 'payments'}
+            dict per call, the entries are the shared score table tuples
+            themselves, so scoring many hands allocates nothing per row.
+        """
+        table = get_score_table()
+        results = []
+        for han, fu, is_oya, is_tsumo in rows:
+            entry = table.get((min(han, MAX_HAN), fu, bool(is_oya), bool(is_tsumo)))
+            if entry is None:
+                entry = _compute_score(han, fu, is_oya, is_tsumo)
+            results.append(entry)
+        return results
+
+# --- Score Table ---
+# Every (han, fu, is_oya, is_tsumo) combination calculate_fu can produce is
+# scored once; calculate_score and score_batch are then plain lookups.
+
+# Fu values returned by calculate_fu (25 is Chi-toitsu)
+FU_VALUES = (20, 25, 30, 40, 50, 60, 70, 80, 90, 100, 110)
+
+# Anything above scores as Yakuman
+MAX_HAN = 13
+
+_SCORE_TABLE = None
+
+def get_score_table():
+    """
+    Returns the precomputed score table.
+    Key: (han, fu, is_oya, is_tsumo) with han capped at MAX_HAN.
+    Value: (total, payments)
+    """
+    global _SCORE_TABLE
+    if _SCORE_TABLE is None:
+        table = {}
+        for han in range(MAX_HAN + 1):
+            for fu in FU_VALUES:
+                for is_oya in (False, True):
+                    for is_tsumo in (False, True):
+                        table[(han, fu, is_oya, is_tsumo)] = _compute_score(han, fu, is_oya, is_tsumo)
+        _SCORE_TABLE = table
+    return _SCORE_TABLE
+
+def _lookup_score(han, fu, is_oya, is_tsumo):
+    entry = get_score_table().get((min(han, MAX_HAN), fu, bool(is_oya), bool(is_tsumo)))
+    if entry is None:
+        # Fu outside the table (e.g. unrounded input): score it directly
+        entry = _compute_score(han, fu, is_oya, is_tsumo)
+    return entry
+
+def base_points(han, fu):
+    """
+    Basic points of a hand, before the Oya/Ko multipliers.
+    Orders hands by value independently of the seat and win type.
+    """
+    if han == 0:
+        return 0
+
+    # Limit Hand (Mangan+)
+    if han >= 5 or (han >= 4 and fu >= 40) or (han >= 3 and fu >= 70):
+         if han >= 13: return 8000
+         if han >= 11: return 6000
+         if han >= 8: return 4000
+         if han >= 6: return 3000
+         return 2000
+
+    # Normal Hand, capped at Mangan
+    return min(fu * (2 ** (2 + han)), 2000)
+
+def _compute_score(han, fu, is_oya, is_tsumo):
+    """Scores one hand from scratch. Returns (total, payments)."""
+    if han == 0:
+        return (0, '0')
+
+    # 1. Determine Basic Points (Base)
+    base = base_points(han, fu)
+
+    # 2. Calculate Payments
+    # Rounded up to nearest 100
+    def round100(val):
+        return math.ceil(val / 100) * 100
         
-        if is_tsumo:
-            if is_oya:
-                # Oya Tsumo: All pay 1/3 of (Base * 6) -> Base * 2
-                pay = round100(base_points * 2)
-                info['total'] = pay * 3
-                info['payments'] = f"ALL: {pay}"
-            else:
-                # Ko Tsumo: Oya pays 1/2 (Base * 2), Ko pays 1/4 (Base * 1)
-                pay_oya = round100(base_points * 2)
-                pay_ko = round100(base_points)
-                info['total'] = pay_oya + (pay_ko * 2)
-                info['payments'] = f"Oya: {pay_oya}, Ko: {pay_ko}"
+    if is_tsumo:
+        if is_oya:
+            # Oya Tsumo: All pay 1/3 of (Base * 6) -> Base * 2
+            pay = round100(base * 2)
+            return (pay * 3, f"ALL: {pay}")
         else:
-            # Ron
-            multiplier = 6 if is_oya else 4
-            pay = round100(base_points * multiplier)
-            info['total'] = pay
-            info['payments'] = f"Target: {pay}"
-            
-        return info
+            # Ko Tsumo: Oya pays 1/2 (Base * 2), Ko pays 1/4 (Base * 1)
+            pay_oya = round100(base * 2)
+            pay_ko = round100(base)
+            return (pay_oya + (pay_ko * 2), f"Oya: {pay_oya}, Ko: {pay_ko}")
+    else:
+        # Ron
+        multiplier = 6 if is_oya else 4
+        pay = round100(base * multiplier)
+        return (pay, f"Target: {pay}")
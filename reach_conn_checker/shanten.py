@@ -0,0 +1,242 @@
+"""
+shanten.py
+
+This module measures how far a packet (hand) is from a valid structure.
+The shanten number is the count of segment swaps still needed to reach
+Readiness (Tenpai): 0 means Tenpai, -1 means the structure is complete.
+
+The standard form uses the usual melds/partials formula
+    8 - 2 * melds - partials - (1 if pair else 0)
+with melds + partials capped at 4. Each suit is solved once per count
+pattern and memoized, so one evaluation is a handful of dict lookups.
+"""
+
+from .tiles import count_vector
+
+# suit counts -> tuple of 10 ints: best partials for (pair, melds) at
+# index pair * 5 + melds, or -1 if that many melds cannot be formed.
+_SUIT_CACHE = {}
+_HONOR_CACHE = {}
+
+# Table for an empty block: zero melds, zero partials, no pair
+_EMPTY_BLOCK = (0,) + (-1,) * 9
+
+def _solve_block(counts, allow_sequences):
+    """
+    Exhaustively splits a 9-slot suit (or the 7 honors) into melds,
+    partial melds (taatsu) and at most one pair.
+    Returns the best partial count for every (pair, melds) combination.
+    """
+    size = len(counts)
+    memo = {}
+
+    def extend(table, best, melds, partials, pair):
+        # Add one choice (melds/partials/pair) on top of the remainder's table
+        for slot in range(10):
+            sub = table[slot]
+            if sub < 0:
+                continue
+            sub_pair, sub_melds = divmod(slot, 5)
+            if pair and sub_pair:
+                continue
+            target = (pair | sub_pair) * 5 + min(sub_melds + melds, 4)
+            if sub + partials > best[target]:
+                best[target] = sub + partials
+
+    def search(i):
+        while i < size and counts[i] == 0:
+            i += 1
+        if i == size:
+            return _EMPTY_BLOCK
+        key = (i, tuple(counts[i:]))
+        cached = memo.get(key)
+        if cached is not None:
+            return cached
+
+        best = [-1] * 10
+
+        # Triplet
+        if counts[i] >= 3:
+            counts[i] -= 3
+            extend(search(i), best, 1, 0, 0)
+            counts[i] += 3
+
+        if allow_sequences:
+            # Sequence
+            if i <= size - 3 and counts[i + 1] and counts[i + 2]:
+                counts[i] -= 1
+                counts[i + 1] -= 1
+                counts[i + 2] -= 1
+                extend(search(i), best, 1, 0, 0)
+                counts[i] += 1
+                counts[i + 1] += 1
+                counts[i + 2] += 1
+
+        if counts[i] >= 2:
+            counts[i] -= 2
+            sub = search(i)
+            # Pair used as the head, or as a partial triplet
+            extend(sub, best, 0, 0, 1)
+            extend(sub, best, 0, 1, 0)
+            counts[i] += 2
+
+        if allow_sequences:
+            # Ryanmen / Penchan partial
+            if i <= size - 2 and counts[i + 1]:
+                counts[i] -= 1
+                counts[i + 1] -= 1
+                extend(search(i), best, 0, 1, 0)
+                counts[i] += 1
+                counts[i + 1] += 1
+            # Kanchan partial
+            if i <= size - 3 and counts[i + 2]:
+                counts[i] -= 1
+                counts[i + 2] -= 1
+                extend(search(i), best, 0, 1, 0)
+                counts[i] += 1
+                counts[i + 2] += 1
+
+        # Leave one tile isolated
+        counts[i] -= 1
+        extend(search(i), best, 0, 0, 0)
+        counts[i] += 1
+
+        best = tuple(best)
+        memo[key] = best
+        return best
+
+    return search(0)
+
+def _suit_entry(counts, start):
+    key = tuple(counts[start:start + 9])
+    entry = _SUIT_CACHE.get(key)
+    if entry is None:
+        entry = _solve_block(list(key), True)
+        _SUIT_CACHE[key] = entry
+    return entry
+
+def _honor_entry(counts):
+    # Honors never chain, so only the multiset of counts matters
+    key = tuple(sorted(counts[27:34]))
+    entry = _HONOR_CACHE.get(key)
+    if entry is None:
+        entry = _solve_block(list(key), False)
+        _HONOR_CACHE[key] = entry
+    return entry
+
+def _combine(left, right):
+    """Max-plus merge of two (pair, melds) -> partials tables."""
+    merged = [-1] * 10
+    for a in range(10):
+        pa = left[a]
+        if pa < 0:
+            continue
+        pair_a, melds_a = divmod(a, 5)
+        for b in range(10):
+            pb = right[b]
+            if pb < 0:
+                continue
+            pair_b, melds_b = divmod(b, 5)
+            if pair_a and pair_b:
+                continue
+            slot = (pair_a | pair_b) * 5 + min(melds_a + melds_b, 4)
+            if pa + pb > merged[slot]:
+                merged[slot] = pa + pb
+    return merged
+
+def calculate_shanten_standard(hand_input):
+    """Shanten number for the standard form (4 melds + 1 pair)."""
+    return _standard_from_counts(count_vector(hand_input))
+
+def _standard_from_counts(counts):
+    table = _combine(_suit_entry(counts, 0), _suit_entry(counts, 9))
+    table = _combine(table, _suit_entry(counts, 18))
+    table = _combine(table, _honor_entry(counts))
+    return _standard_from_table(table)
+
+def _standard_from_table(table):
+    best = 8
+    for slot in range(10):
+        partials = table[slot]
+        if partials < 0:
+            continue
+        pair, melds = divmod(slot, 5)
+        partials = min(partials, 4 - melds)
+        shanten = 8 - 2 * melds - partials - pair
+        if shanten < best:
+            best = shanten
+    return best
+
+def calculate_shanten_chitoitsu(hand_input):
+    """Shanten number for Seven Pairs (Chii-toitsu)."""
+    return _chitoitsu_from_counts(count_vector(hand_input))
+
+def _chitoitsu_from_counts(counts):
+    pairs = 0
+    kinds = 0
+    for c in counts:
+        if c:
+            kinds += 1
+            if c >= 2:
+                pairs += 1
+    # Four of a kind counts as one pair only, so missing kinds cost extra
+    return 6 - pairs + max(0, 7 - kinds)
+
+def calculate_shanten(hand_input):
+    """
+    Returns the minimum shanten number over the standard form and Seven Pairs.
+    Works for 13 or 14 segments (14 reports -1 when the structure is complete).
+
+    Args:
+        hand_input (list or HandCounts): Current hand segments.
+    """
+    return shanten_from_counts(count_vector(hand_input))
+
+def shanten_from_counts(counts):
+    """Same as calculate_shanten, for a raw 34-slot count list."""
+    return min(_standard_from_counts(counts), _chitoitsu_from_counts(counts))
+
+def improving_draws(counts):
+    """
+    Finds the draws that lower the shanten number of a raw count list.
+    Only the block touched by each draw is looked up again; the other
+    three blocks are merged once up front.
+
+    Returns:
+        tuple: (shanten, list of slots whose draw lowers it)
+    """
+    blocks = [_suit_entry(counts, 0), _suit_entry(counts, 9),
+              _suit_entry(counts, 18), _honor_entry(counts)]
+    rest = []
+    for k in range(4):
+        others = [blocks[j] for j in range(4) if j != k]
+        rest.append(_combine(_combine(others[0], others[1]), others[2]))
+
+    pairs = 0
+    kinds = 0
+    for c in counts:
+        if c:
+            kinds += 1
+            if c >= 2:
+                pairs += 1
+    shanten = min(_standard_from_table(_combine(rest[0], blocks[0])),
+                  6 - pairs + max(0, 7 - kinds))
+
+    draws = []
+    for index in range(34):
+        c = counts[index]
+        if c >= 4:
+            continue
+        new_pairs = pairs + (1 if c == 1 else 0)
+        new_kinds = kinds + (1 if c == 0 else 0)
+        if 6 - new_pairs + max(0, 7 - new_kinds) < shanten:
+            draws.append(index)
+            continue
+        k = min(index // 9, 3)
+        counts[index] += 1
+        entry = _honor_entry(counts) if k == 3 else _suit_entry(counts, k * 9)
+        counts[index] -= 1
+        if _standard_from_table(_combine(rest[k], entry)) < shanten:
+            draws.append(index)
+    return shanten, draws
+
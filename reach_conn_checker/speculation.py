@@ -0,0 +1,75 @@
+"""
+speculation.py
+
+Uses the time the player spends at the ADMIN prompt.
+
+While a command is awaited, a worker thread works out what the rest of the
+turn will ask for:
+    - CpuAgent.can_ron for every tile the player could discard
+      (the wait tiles of the CPU's 13-tile hand), and
+    - the player's Reach discards (map_tenpai_discards of the 14-tile hand).
+
+The worker only sees copies of both hands. Results are keyed by the hand
+state and handed to the live objects (CpuAgent.prime_waits /
+ConnectionManager.prime_reach_discards) only while that state is still
+current, so 'ping <idx>' and 'ping -t' resolve from cache.
+"""
+
+import asyncio
+
+from .network_rules import check_protocol_readiness, map_tenpai_discards
+
+def hand_state(manager, cpu):
+    """Key of the state a speculation is valid for."""
+    return tuple(manager.hand), tuple(cpu.hand)
+
+def evaluate(player_hand, cpu_hand):
+    """The speculative answers for one hand state (runs in the worker)."""
+    is_tenpai, waits = check_protocol_readiness(cpu_hand)
+    cpu_waits = frozenset(waits) if is_tenpai else frozenset()
+    return {
+        'cpu_waits': cpu_waits,
+        'cpu_ron': {tile: tile in cpu_waits for tile in set(player_hand)},
+        'reach_discards': map_tenpai_discards(player_hand),
+    }
+
+class Speculator:
+    """
+    Runs evaluate() in an executor while the player thinks.
+    Only the latest hand state is kept.
+    """
+    def __init__(self, executor=None):
+        """
+        Args:
+            executor: concurrent.futures executor (default: the loop's).
+        """
+        self.executor = executor
+        self.results = {}
+        self._pending = None # (state, future) being evaluated
+
+    def start(self, manager, cpu):
+        """Starts evaluating the current state unless it is known or running."""
+        state = hand_state(manager, cpu)
+        if state in self.results or (self._pending and self._pending[0] == state):
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, evaluate, manager.hand.copy(), cpu.hand.copy())
+        self._pending = (state, future)
+
+    async def apply(self, manager, cpu):
+        """
+        Primes the caches of `manager` and `cpu` with the result for their
+        current state, waiting for it if it is still being evaluated.
+        Returns the result, or None if that state was never speculated.
+        """
+        state = hand_state(manager, cpu)
+        if self._pending and self._pending[0] == state:
+            future = self._pending[1]
+            self._pending = None
+            self.results = {state: await future}
+        result = self.results.get(state)
+        if result is None:
+            return None
+        cpu.prime_waits(result['cpu_waits'])
+        manager.prime_reach_discards(result['reach_discards'])
+        return result
@@ -0,0 +1,193 @@
+"""
+stats.py
+
+Streaming statistics for simulation output.
+
+Everything here keeps a fixed amount of state no matter how many values
+are added: running mean/variance (Welford), fixed-bucket histograms and
+yaku counts. Aggregates built in different worker processes are combined
+with merge() and round-trip through JSON via to_dict()/from_dict().
+"""
+
+import json
+import math
+from bisect import bisect_right
+from collections import Counter
+
+# Lower bounds of the histogram buckets; the last bucket is open-ended.
+HAN_EDGES = (0, 1, 2, 3, 4, 5, 6, 8, 11, 13)
+FU_EDGES = (20, 25, 30, 40, 50, 60, 70, 80, 90, 100, 110)
+POINT_EDGES = (0, 1000, 2000, 3900, 5200, 7700, 8000, 12000, 16000, 24000, 32000, 48000)
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream (Welford's algorithm)."""
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        """Adds the values summarized by `other` (Chan et al.). Returns self."""
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (0.0 for fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.min = data['min']
+        stats.max = data['max']
+        return stats
+
+class Histogram:
+    """
+    Counts per fixed bucket. Bucket i holds edges[i] <= x < edges[i + 1];
+    values below edges[0] go to the first bucket, the last is open-ended.
+    """
+    __slots__ = ('edges', 'counts')
+
+    def __init__(self, edges):
+        self.edges = tuple(edges)
+        self.counts = [0] * len(self.edges)
+
+    def add(self, x, n=1):
+        self.counts[max(bisect_right(self.edges, x) - 1, 0)] += n
+
+    def merge(self, other):
+        """Adds the counts of a histogram with the same edges. Returns self."""
+        if other.edges != self.edges:
+            raise ValueError("Cannot merge histograms with different edges")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def to_dict(self):
+        return {'edges': list(self.edges), 'counts': list(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data['edges'])
+        if len(data['counts']) != len(hist.counts):
+            raise ValueError("Histogram counts do not match its edges")
+        hist.counts = list(data['counts'])
+        return hist
+
+class HandStats:
+    """
+    Streaming summary of scored hands: han, fu and points (mean/variance and
+    histograms) plus how often each yaku appeared.
+    """
+    def __init__(self):
+        self.han = RunningStats()
+        self.fu = RunningStats()
+        self.points = RunningStats()
+        self.han_hist = Histogram(HAN_EDGES)
+        self.fu_hist = Histogram(FU_EDGES)
+        self.points_hist = Histogram(POINT_EDGES)
+        self.yaku = Counter()
+
+    @property
+    def count(self):
+        return self.han.count
+
+    def add(self, han, fu, points, yaku=()):
+        self.han.add(han)
+        self.fu.add(fu)
+        self.points.add(points)
+        self.han_hist.add(han)
+        self.fu_hist.add(fu)
+        self.points_hist.add(points)
+        self.yaku.update(yaku)
+
+    def add_result(self, res):
+        """
+        Adds a YakuChecker.execute() result. The points are taken from the
+        ScoreCalculator.calculate_score() dict under 'score' (as returned
+        by engine.score_hand) or from a plain 'points' value.
+        """
+        points = res['score']['total'] if 'score' in res else res['points']
+        self.add(res['han'], res['fu'], points, res['yaku'])
+
+    def merge(self, other):
+        self.han.merge(other.han)
+        self.fu.merge(other.fu)
+        self.points.merge(other.points)
+        self.han_hist.merge(other.han_hist)
+        self.fu_hist.merge(other.fu_hist)
+        self.points_hist.merge(other.points_hist)
+        self.yaku.update(other.yaku)
+        return self
+
+    def to_dict(self):
+        return {
+            'han': self.han.to_dict(),
+            'fu': self.fu.to_dict(),
+            'points': self.points.to_dict(),
+            'han_hist': self.han_hist.to_dict(),
+            'fu_hist': self.fu_hist.to_dict(),
+            'points_hist': self.points_hist.to_dict(),
+            'yaku': dict(self.yaku),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.han = RunningStats.from_dict(data['han'])
+        stats.fu = RunningStats.from_dict(data['fu'])
+        stats.points = RunningStats.from_dict(data['points'])
+        stats.han_hist = Histogram.from_dict(data['han_hist'])
+        stats.fu_hist = Histogram.from_dict(data['fu_hist'])
+        stats.points_hist = Histogram.from_dict(data['points_hist'])
+        stats.yaku = Counter(data['yaku'])
+        return stats
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
@@ -0,0 +1,287 @@
+"""
+tiles.py
+
+This module defines the shared count-vector representation of a packet (hand).
+A hand is stored as 34 small counters (one per segment type) so that the
+rule engine can test membership, add and remove segments without scanning
+or copying lists of strings.
+
+Slot layout:
+    0-8:   1m-9m
+    9-17:  1p-9p
+    18-26: 1s-9s
+    27-30: east, south, west, north
+    31-33: white, green, red
+"""
+
+from bisect import bisect_left, bisect_right
+
+# 麻雀牌をシステムログ風のコードに変換する辞書
+TILE_MAP = {
+    # Manzu (1m - 9m)
+    "1m": "ADDR_10", "2m": "ADDR_11", "3m": "ADDR_12",
+    "4m": "ADDR_13", "5m": "ADDR_14", "6m": "ADDR_15",
+    "7m": "ADDR_16", "8m": "ADDR_17", "9m": "ADDR_18",
+    
+    # Pinzu (1p - 9p)
+    "1p": "PROC_20", "2p": "PROC_21", "3p": "PROC_22",
+    "4p": "PROC_23", "5p": "PROC_24", "6p": "PROC_25",
+    "7p": "PROC_26", "8p": "PROC_27", "9p": "PROC_28",
+    
+    # Souzu (1s - 9s)
+    "1s": "THRD_30", "2s": "THRD_31", "3s": "THRD_32",
+    "4s": "THRD_33", "5s": "THRD_34", "6s": "THRD_35",
+    "7s": "THRD_36", "8s": "THRD_37", "9s": "THRD_38",
+    
+    # Honors
+    "east": "HOST_E", "south": "HOST_S", "west": "HOST_W", "north": "HOST_N",
+    "white": "[NULL]", "green": "[G_O_F]", "red": "[R_E_D]"
+}
+
+class Tile:
+    """
+    One of the 34 tile kinds.
+
+    Instances are interned: TILES[id] and get_tile(name) always return the
+    same object, and every derived form is a precomputed attribute.
+        id:       slot in the count vector (0-33)
+        name:     tile string ('1m', 'east', ...)
+        int_code: structural integer code (see network_rules._parse_hand)
+        sort_key: display order key (Manzu -> Pinzu -> Souzu -> Winds -> Dragons)
+        code:     display code from TILE_MAP
+        suit:     'm', 'p', 's' or 'z' (honors)
+        number:   1-9 for suits, 1-7 for east..red
+    """
+    __slots__ = ('id', 'name', 'int_code', 'sort_key', 'code', 'suit', 'number')
+
+    def __init__(self, id, name, int_code, sort_key, suit, number):
+        self.id = id
+        self.name = name
+        self.int_code = int_code
+        self.sort_key = sort_key
+        self.code = TILE_MAP[name]
+        self.suit = suit
+        self.number = number
+
+    def __repr__(self):
+        return f"Tile({self.name!r})"
+
+def _build_tiles():
+    tiles = []
+    for k, suit in enumerate("mps"):
+        for n in range(1, 10):
+            tiles.append(Tile(len(tiles), f"{n}{suit}", k * 10 + n, k * 100 + n, suit, n))
+    honors = ["east", "south", "west", "north", "white", "green", "red"]
+    for n, name in enumerate(honors, 1):
+        # Odd integer codes keep honors out of sequences
+        int_code = 31 + 2 * (n - 1) if n <= 4 else 41 + 2 * (n - 5)
+        sort_key = 300 + n if n <= 4 else 400 + n - 4
+        tiles.append(Tile(len(tiles), name, int_code, sort_key, 'z', n))
+    return tuple(tiles)
+
+TILES = _build_tiles()
+
+TILE_REGISTRY = {tile.name: tile for tile in TILES}
+
+TILE_NAMES = [tile.name for tile in TILES]
+
+TILE_INDEX = {tile.name: tile.id for tile in TILES}
+
+# Integer codes used by the structural analysis (see network_rules._parse_hand)
+TILE_INTS = [tile.int_code for tile in TILES]
+
+INT_TO_INDEX = {t: i for i, t in enumerate(TILE_INTS)}
+
+def get_tile(name):
+    """Returns the interned Tile for a tile string (None if unknown)."""
+    return TILE_REGISTRY.get(name)
+
+def tile_to_int(tile):
+    """Returns the structural integer code for a tile string (0 if unknown)."""
+    tile = TILE_REGISTRY.get(tile)
+    if tile is None:
+        return 0
+    return tile.int_code
+
+def tile_sort_key(tile):
+    """Display sort key of a tile string; unknown tiles sort last."""
+    entry = TILE_REGISTRY.get(tile)
+    if entry is None:
+        return 999 if tile == "unknown" else 900
+    return entry.sort_key
+
+def tile_code(tile):
+    """Display code of a tile string ("UNKNOWN" if not a tile)."""
+    entry = TILE_REGISTRY.get(tile)
+    if entry is None:
+        return "UNKNOWN"
+    return entry.code
+
+class HandCounts:
+    """
+    A hand as a 34-slot count vector.
+
+    Behaves like a sorted multiset of tile strings: len() is the number of
+    tiles, iteration yields tile strings in slot order and `in` tests
+    membership. Unknown tile strings are ignored, as in _parse_hand.
+    """
+    __slots__ = ('counts', 'size')
+
+    def __init__(self, hand=None):
+        self.counts = [0] * 34
+        self.size = 0
+        if hand:
+            for tile in hand:
+                index = TILE_INDEX.get(tile)
+                if index is not None:
+                    self.counts[index] += 1
+                    self.size += 1
+
+    @classmethod
+    def from_counts(cls, counts):
+        hand = cls()
+        hand.counts = list(counts)
+        hand.size = sum(hand.counts)
+        return hand
+
+    def copy(self):
+        hand = HandCounts()
+        hand.counts = self.counts[:]
+        hand.size = self.size
+        return hand
+
+    def add(self, tile):
+        self.counts[TILE_INDEX[tile]] += 1
+        self.size += 1
+
+    def remove(self, tile):
+        """Removes one copy of tile. Raises ValueError if it is not held."""
+        index = TILE_INDEX.get(tile)
+        if index is None or self.counts[index] == 0:
+            raise ValueError(f"{tile} not in hand")
+        self.counts[index] -= 1
+        self.size -= 1
+
+    def count(self, tile):
+        index = TILE_INDEX.get(tile)
+        if index is None:
+            return 0
+        return self.counts[index]
+
+    def with_tile(self, tile):
+        """Returns a HandCounts copy of this hand with one more tile."""
+        hand = HandCounts.copy(self)
+        hand.add(tile)
+        return hand
+
+    def key(self):
+        """Hashable canonical form of the hand."""
+        return tuple(self.counts)
+
+    def to_tiles(self):
+        """Returns the hand as a list of tile strings in slot order."""
+        return list(self)
+
+    def to_ints(self):
+        """Returns the sorted structural integer codes (same as _parse_hand)."""
+        ints = []
+        for index, c in enumerate(self.counts):
+            if c:
+                ints.extend([TILE_INTS[index]] * c)
+        return ints
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for index, c in enumerate(self.counts):
+            for _ in range(c):
+                yield TILE_NAMES[index]
+
+    def __contains__(self, tile):
+        return self.count(tile) > 0
+
+    def __eq__(self, other):
+        if isinstance(other, HandCounts):
+            return self.counts == other.counts
+        return NotImplemented
+
+    def __repr__(self):
+        return f"HandCounts({self.to_tiles()!r})"
+
+class SortedHand(HandCounts):
+    """
+    A HandCounts that also keeps its tiles as a list in display order.
+
+    Adding and removing tiles update both forms in place (bisect
+    insertion), so the sorted hand never has to be rebuilt: hand[i] is
+    the tile shown at display index i.
+    """
+    __slots__ = ('tiles', '_ids')
+
+    def __init__(self, hand=None):
+        HandCounts.__init__(self, hand)
+        self._ids = []
+        for index, c in enumerate(self.counts):
+            self._ids.extend([index] * c)
+        self.tiles = [TILE_NAMES[index] for index in self._ids]
+
+    def copy(self):
+        hand = SortedHand()
+        hand.counts = self.counts[:]
+        hand.size = self.size
+        hand._ids = self._ids[:]
+        hand.tiles = self.tiles[:]
+        return hand
+
+    def add(self, tile):
+        index = TILE_INDEX[tile]
+        self.counts[index] += 1
+        self.size += 1
+        pos = bisect_right(self._ids, index)
+        self._ids.insert(pos, index)
+        self.tiles.insert(pos, tile)
+
+    def remove(self, tile):
+        """Removes one copy of tile. Raises ValueError if it is not held."""
+        HandCounts.remove(self, tile)
+        pos = bisect_left(self._ids, TILE_INDEX[tile])
+        del self._ids[pos]
+        del self.tiles[pos]
+
+    def pop(self, display_index):
+        """Removes and returns the tile at a display index."""
+        index = self._ids.pop(display_index)
+        tile = self.tiles.pop(display_index)
+        self.counts[index] -= 1
+        self.size -= 1
+        return tile
+
+    def index(self, tile):
+        """Display index of the first copy of tile (ValueError if absent)."""
+        return self.tiles.index(tile)
+
+    def __getitem__(self, display_index):
+        return self.tiles[display_index]
+
+    def __iter__(self):
+        return iter(self.tiles)
+
+    def __repr__(self):
+        return f"SortedHand({self.tiles!r})"
+
+def count_vector(hand_input, copy=False):
+    """
+    Returns the 34-slot count list of a hand given as a tile list or a
+    HandCounts. A HandCounts' own list is returned unless copy is True;
+    a converted tile list is always a fresh list.
+    """
+    if isinstance(hand_input, HandCounts):
+        return hand_input.counts[:] if copy else hand_input.counts
+    return HandCounts(hand_input).counts
+
+def as_counts(hand_input):
+    """Returns hand_input as a HandCounts, converting a tile list if needed."""
+    if isinstance(hand_input, HandCounts):
+        return hand_input
+    return HandCounts(hand_input)
@@ -0,0 +1,270 @@
+"""
+tournament.py
+
+Parallel CPU-vs-CPU tournaments for evaluating CpuAgent strategies.
+
+Games are identified by (seed, index) and played headless with a
+CpuPlayer on the local side and a CpuAgent on the remote side, so every
+game is reproducible on its own. Game indices are split into shards that
+a process pool plays independently; finished shards stream back in any
+order as mergeable totals (see stats.py), are appended to a JSONL
+checkpoint and merged into the running totals, so memory and checkpoint
+size per shard stay constant however many games a shard plays. An
+interrupted run started again with the same checkpoint only plays the
+shards that are missing.
+
+Usage:
+    python -m reach_conn_checker.tournament --games 10000 [--seed 0]
+        [--workers N] [--shard-size 250] [--checkpoint run.jsonl]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+
+from .engine import CpuPlayer, play_headless
+from .stats import HandStats, RunningStats
+
+DEFAULT_SHARD_SIZE = 250
+
+SIDES = ('player', 'cpu')
+
+def game_seed(seed, index):
+    """Session seed of game `index` in a tournament seeded with `seed`."""
+    return f"{seed}/{index}"
+
+def play_game(seed, index):
+    """Plays one CPU-vs-CPU game and returns its record."""
+    session = game_seed(seed, index)
+    player = CpuPlayer(rng=random.Random(f"{session}:player"))
+    result = play_headless(player, seed=session)
+    return {
+        'index': index,
+        'winner': result['winner'],
+        'win_type': result['win_type'],
+        'turns': result['turns'],
+        'han': result['han'],
+        'fu': result['fu'],
+        'points': result['points'],
+        'yaku': result['yaku'],
+    }
+
+def play_shard(task):
+    """
+    Worker entry point: plays games [start, stop) of one shard and returns
+    their aggregated totals, so no game record leaves the worker.
+    """
+    seed, shard, start, stop = task
+    totals = TournamentTotals()
+    for index in range(start, stop):
+        totals.add(play_game(seed, index))
+    return {
+        'seed': seed,
+        'shard': shard,
+        'start': start,
+        'stop': stop,
+        'totals': totals.to_dict(),
+    }
+
+def make_shards(seed, games, shard_size):
+    """Splits game indices 0..games-1 into (seed, shard, start, stop) tasks."""
+    return [
+        (seed, shard, start, min(start + shard_size, games))
+        for shard, start in enumerate(range(0, games, shard_size))
+    ]
+
+def load_checkpoint(path):
+    """
+    Reads the finished shards of a checkpoint file.
+    A last line cut off by an interrupted write is dropped and truncated
+    from the file, so appending can continue safely.
+    """
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    good_size = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+            good_size += len(line)
+    if good_size < os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(good_size)
+    return entries
+
+class TournamentTotals:
+    """
+    Running aggregates over game records, built on the streaming stats
+    so their size does not grow with the number of games. Totals from
+    different shards are combined with merge().
+    """
+    def __init__(self):
+        self.games = 0
+        self.draws = 0
+        self.tsumo = {side: 0 for side in SIDES}
+        self.deal_ins = {side: 0 for side in SIDES}
+        # Turns to win and scored hands of each side's wins
+        self.win_turns = {side: RunningStats() for side in SIDES}
+        self.hands = {side: HandStats() for side in SIDES}
+
+    def add(self, record):
+        self.games += 1
+        winner = record['winner']
+        if winner is None:
+            self.draws += 1
+            return
+        self.hands[winner].add_result(record)
+        self.win_turns[winner].add(record['turns'])
+        if record['win_type'] == 'tsumo':
+            self.tsumo[winner] += 1
+        else:
+            # The other side discarded the winning tile
+            loser = 'cpu' if winner == 'player' else 'player'
+            self.deal_ins[loser] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.draws += other.draws
+        for side in SIDES:
+            self.tsumo[side] += other.tsumo[side]
+            self.deal_ins[side] += other.deal_ins[side]
+            self.win_turns[side].merge(other.win_turns[side])
+            self.hands[side].merge(other.hands[side])
+        return self
+
+    def to_dict(self):
+        return {
+            'games': self.games,
+            'draws': self.draws,
+            'tsumo': dict(self.tsumo),
+            'deal_ins': dict(self.deal_ins),
+            'win_turns': {side: self.win_turns[side].to_dict() for side in SIDES},
+            'hands': {side: self.hands[side].to_dict() for side in SIDES},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        totals = cls()
+        totals.games = data['games']
+        totals.draws = data['draws']
+        totals.tsumo = dict(data['tsumo'])
+        totals.deal_ins = dict(data['deal_ins'])
+        totals.win_turns = {side: RunningStats.from_dict(data['win_turns'][side]) for side in SIDES}
+        totals.hands = {side: HandStats.from_dict(data['hands'][side]) for side in SIDES}
+        return totals
+
+    def summary(self):
+        """Aggregates as a JSON-ready dict."""
+        def rate(n, d):
+            return n / d if d else 0.0
+
+        sides = {}
+        for side in SIDES:
+            hands = self.hands[side]
+            wins = hands.count
+            sides[side] = {
+                'wins': wins,
+                'win_rate': rate(wins, self.games),
+                'tsumo': self.tsumo[side],
+                'ron': wins - self.tsumo[side],
+                'deal_ins': self.deal_ins[side],
+                'deal_in_rate': rate(self.deal_ins[side], self.games),
+                'avg_points': hands.points.mean,
+                'points_stdev': hands.points.stdev,
+                'avg_turns_to_win': self.win_turns[side].mean,
+                'han_hist': hands.han_hist.to_dict(),
+                'fu_hist': hands.fu_hist.to_dict(),
+                'points_hist': hands.points_hist.to_dict(),
+                'yaku': dict(hands.yaku.most_common()),
+            }
+        return {
+            'games': self.games,
+            'draws': self.draws,
+            'draw_rate': rate(self.draws, self.games),
+            'sides': sides,
+        }
+
+def run_tournament(games, seed="0", workers=None, shard_size=DEFAULT_SHARD_SIZE,
+                   checkpoint=None, progress=None):
+    """
+    Plays `games` seeded CPU-vs-CPU games and returns the summary dict.
+
+    Args:
+        games (int): Number of games.
+        seed: Tournament seed; game i is seeded with game_seed(seed, i).
+            Used as a string, so 0 and "0" name the same tournament and
+            the same checkpoint shards.
+        workers (int): Worker processes (default: CPU count; 1 = in-process).
+        shard_size (int): Games per worker task.
+        checkpoint (str): JSONL file of finished shards. Existing shards of
+            the same seed are reused, new ones are appended.
+        progress (callable): Called with (games_done, games) after each shard.
+    """
+    seed = str(seed)
+    totals = TournamentTotals()
+    tasks = make_shards(seed, games, shard_size)
+
+    wanted = set(tasks)
+    done = set()
+    if checkpoint:
+        for entry in load_checkpoint(checkpoint):
+            key = (entry['seed'], entry['shard'], entry['start'], entry['stop'])
+            if key in done or key not in wanted:
+                continue
+            done.add(key)
+            totals.merge(TournamentTotals.from_dict(entry['totals']))
+    pending = [task for task in tasks if task not in done]
+
+    out = open(checkpoint, "a") if checkpoint else None
+    try:
+        for entry in _play_shards(pending, workers):
+            if out:
+                out.write(json.dumps(entry) + "\n")
+                out.flush()
+            totals.merge(TournamentTotals.from_dict(entry['totals']))
+            if progress:
+                progress(totals.games, games)
+    finally:
+        if out:
+            out.close()
+    return totals.summary()
+
+def _play_shards(tasks, workers):
+    """Yields finished shards as they complete."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            yield play_shard(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for entry in pool.imap_unordered(play_shard, tasks):
+            yield entry
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CPU-vs-CPU tournament")
+    parser.add_argument("--games", type=int, default=1000, help="games to play")
+    parser.add_argument("--seed", default="0", help="tournament seed")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="games per task")
+    parser.add_argument("--checkpoint", help="JSONL checkpoint to resume from / append to")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\r{done}/{total} games", end="", flush=True)
+
+    summary = run_tournament(args.games, args.seed, args.workers, args.shard_size,
+                             args.checkpoint, progress)
+    print()
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
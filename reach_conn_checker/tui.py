@@ -1,15 +1,36 @@
 
+import asyncio
 import curses
 import time
 import textwrap
+from collections import deque
+
+from .tiles import tile_code
 
 class CursesInterface:
+    # Longest a blocking read waits before the header clock is checked (ms)
+    MAX_INPUT_WAIT_MS = 1000
+    # Shortest time between two frames written to the terminal (s)
+    FRAME_INTERVAL = 1 / 30
+
     def __init__(self, stdscr):
         self.stdscr = stdscr
-        self.log_lines = []
         self.max_log_lines = 100
+        # (text, color, wrapped rows for the current width) per log line
+        self.log_lines = deque(maxlen=self.max_log_lines)
+        # Rows of the log window in use (it fills top-down, then scrolls)
+        self._log_filled = 0
         self.input_buffer = ""
         self.cursor_pos = 0
+        # Second shown by the header clock (None = header needs a redraw)
+        self._header_second = None
+        # Windows changed since the last frame, and when that frame was written
+        self._dirty = set()
+        self._last_frame = 0.0
+        # (loop, TimerHandle) of the flush scheduled for held-back changes
+        self._flush_timer = None
+        # (hand line, reach) currently shown in the status window
+        self._status_key = None
         
         # Color initialization
         curses.start_color()
@@ -26,7 +47,7 @@ class CursesInterface:
         except:
             pass
             
-        self.stdscr.nodelay(True) # Non-blocking input
+        # Input blocks in getch() with a timeout (set per read, see get_command)
         self.stdscr.keypad(True)
         
         # Window setup placeholders
@@ -82,72 +103,79 @@ class CursesInterface:
         
         self.win_log = curses.newwin(self.win_log_h, self.win_log_w, self.win_log_y, self.win_log_x)
         self.win_log.scrollok(True)
+        # The width changed: re-wrap the backlog once and repaint it
+        self.log_lines = deque(
+            ((text, cpf, self._wrap(text)) for text, cpf, _ in self.log_lines),
+            maxlen=self.max_log_lines)
+        self.render_log()
         
         self.win_status = curses.newwin(self.win_status_h, self.win_status_w, self.win_status_y, self.win_status_x)
         
         self.win_input = curses.newwin(self.win_input_h, self.win_input_w, self.win_input_y, self.win_input_x)
+        self.win_input.keypad(True)
+        self._header_second = None
+        self._status_key = None
+        self._dirty = {self.win_log, self.win_input}
+        self._schedule_flush()
 
     def draw_header(self):
-        header_text = f"REACH CONNECTION CHECKER v1.0.0 | Uptime: {time.strftime('%H:%M:%S')} | Protocol: IPv4/v6 | Secure Mode: ACTIVE"
+        """Redraws the header, only when the second shown by its clock changed."""
+        now = int(time.time())
+        if now == self._header_second:
+            return
+        self._header_second = now
+        header_text = f"REACH CONNECTION CHECKER v1.0.0 | Uptime: {time.strftime('%H:%M:%S', time.localtime(now))} | Protocol: IPv4/v6 | Secure Mode: ACTIVE"
         # Pad with spaces
         header_text = header_text.ljust(self.cols)
         try:
             self.stdscr.addstr(0, 0, header_text[:self.cols], curses.color_pair(2) | curses.A_REVERSE)
         except curses.error:
             pass
+        self._mark_dirty(self.stdscr)
+
+    def _wrap(self, text):
+        """Display rows of one log line at the current width."""
+        return textwrap.wrap(text, self.cols - 1) or [""]
 
     def log(self, message, color_pair_idx=1):
-        """Add a line to the log window."""
+        """Add a line to the log window, drawing only the new rows."""
         # Handle newlines in message
-        lines = message.split('\n')
-        for line in lines:
-            self.log_lines.append((line, color_pair_idx))
-            
-        if len(self.log_lines) > self.max_log_lines:
-            self.log_lines = self.log_lines[-self.max_log_lines:]
-            
-        # Draw log immediately? Or wait for refresh?
-        # Let's just redraw log window contents
-        self.render_log()
+        for line in message.split('\n'):
+            rows = self._wrap(line)
+            self.log_lines.append((line, color_pair_idx, rows))
+            for row in rows:
+                self._draw_log_row(row, color_pair_idx)
+        self._mark_dirty(self.win_log)
+
+    def _draw_log_row(self, text, cpf):
+        """Writes one row below the previous one, scrolling once the window is full."""
+        if self._log_filled < self.win_log_h:
+            y = self._log_filled
+            self._log_filled += 1
+        else:
+            self.win_log.scroll(1)
+            y = self.win_log_h - 1
+        try:
+            self.win_log.addstr(y, 0, text, curses.color_pair(cpf))
+        except curses.error:
+            pass
 
     def render_log(self):
+        """Repaints the whole log window (after a resize)."""
         self.win_log.erase()
-        
-        # Calculate how many lines fit
-        max_display_lines = self.win_log_h
-        
-        # We need to wrap lines if they are too long?
-        # For simplicity, truncate or simple wrap handled by logic?
-        # Let's just take last N entries.
-        # Ideally we wrap text.
-        
-        display_queue = []
-        for text, cpf in reversed(self.log_lines):
-            # Wrap text
-            wrapped = textwrap.wrap(text, self.cols - 1)
-            if not wrapped: wrapped = [""]
-            for w in reversed(wrapped):
-                display_queue.insert(0, (w, cpf))
-                if len(display_queue) >= max_display_lines:
-                    break
-            if len(display_queue) >= max_display_lines:
-                    break
-                    
-        for i, (text, cpf) in enumerate(display_queue):
-            try:
-                self.win_log.addstr(i, 0, text, curses.color_pair(cpf))
-            except curses.error:
-                pass
-                
-        self.win_log.noutrefresh()
+        self._log_filled = 0
+
+        # Only the rows that still fit on screen
+        rows = deque(maxlen=self.win_log_h)
+        for text, cpf, wrapped in self.log_lines:
+            for row in wrapped:
+                rows.append((row, cpf))
+        for text, cpf in rows:
+            self._draw_log_row(text, cpf)
+
+        self._mark_dirty(self.win_log)
 
     def update_status(self, manager, cpu_agent=None, latency_check=False):
-        self.win_status.erase()
-        
-        # Separator
-        self.win_status.hline(0, 0, '-', self.cols, curses.color_pair(2))
-        self.win_status.addstr(0, 2, " SYSTEM MEMORY DUMP ", curses.color_pair(2))
-        
         # Hand Display
         # Format: [Index:CODE] ...
         # Color coding: Normal = Green, Highlight/Selected? No selection in CLI logic yet.
@@ -155,10 +183,22 @@ class CursesInterface:
         # Hand lines
         hand_strs = []
         for idx, tile in enumerate(manager.get_hand()):
-            code = manager.get_code(tile)
+            code = tile_code(tile)
             hand_strs.append(f"[{idx}:{code}]")
             
         hand_line = " ".join(hand_strs)
+
+        # Nothing to repaint if the window already shows this state
+        status_key = (hand_line, manager.is_reach)
+        if status_key == self._status_key:
+            return
+        self._status_key = status_key
+
+        self.win_status.erase()
+        
+        # Separator
+        self.win_status.hline(0, 0, '-', self.cols, curses.color_pair(2))
+        self.win_status.addstr(0, 2, " SYSTEM MEMORY DUMP ", curses.color_pair(2))
         
         # Wrap hand line
         wrapped_hand = textwrap.wrap(hand_line, self.cols - 2)
@@ -189,7 +229,7 @@ class CursesInterface:
         except curses.error:
             pass
             
-        self.win_status.noutrefresh()
+        self._mark_dirty(self.win_status)
 
     def render_input(self):
         self.win_input.erase()
@@ -203,29 +243,106 @@ class CursesInterface:
         except:
             pass
             
-        self.win_input.noutrefresh()
+        self._mark_dirty(self.win_input)
+
+    def _mark_dirty(self, win):
+        self._dirty.add(win)
+        self._schedule_flush()
 
-    def refresh(self):
+    def _schedule_flush(self):
+        """
+        On an event loop, makes sure held-back changes are written within a
+        frame even if nobody calls refresh() again (e.g. while the game
+        awaits input). Without a running loop, callers flush before blocking.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._flush_timer and self._flush_timer[0] is loop and not self._flush_timer[1].cancelled():
+            return
+        delay = max(0.0, self.FRAME_INTERVAL - (time.monotonic() - self._last_frame))
+        self._flush_timer = (loop, loop.call_later(delay, self._flush_due))
+
+    def _flush_due(self):
+        self._flush_timer = None
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """
+        Ends a frame: queues the windows changed since the last one and
+        writes them to the terminal with a single doupdate(). A frame
+        requested sooner than FRAME_INTERVAL after the previous one is
+        merged into the next (scheduled on the event loop, if any),
+        unless forced (before blocking).
+        """
         self.draw_header()
-        
-        # We used noutrefresh on subwindows, now do doupdate
+        if not self._dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_frame < self.FRAME_INTERVAL:
+            self._schedule_flush()
+            return
+        if self._flush_timer:
+            self._flush_timer[1].cancel()
+            self._flush_timer = None
+        # Header first: stdscr must not cover the other windows
+        for win in (self.stdscr, self.win_log, self.win_status, self.win_input):
+            if win in self._dirty:
+                win.noutrefresh()
+        self._dirty.clear()
         curses.doupdate()
+        self._last_frame = now
+
+    def pause(self, seconds):
+        """Pacing delay between actions (keeps the screen current first)."""
+        self.refresh(force=True)
+        time.sleep(seconds)
+
+    async def pause_async(self, seconds):
+        """pause() as a timer: input is still handled while it runs."""
+        self.refresh(force=True)
+        await asyncio.sleep(seconds)
+
+    def ms_to_next_second(self):
+        """Milliseconds until the header clock has to show the next second."""
+        wait = 1000 - int((time.time() % 1) * 1000)
+        return max(1, min(wait, self.MAX_INPUT_WAIT_MS))
 
-    def get_command(self):
+    def get_command(self, timeout=0):
         """
-        Non-blocking check for input.
-        Returns: 
+        Reads keys until a command is entered.
+        Blocks in getch() instead of polling: it wakes up for a key, or
+        when the header clock reaches its next second.
+
+        Args:
+            timeout (float): Seconds to wait for a command. 0 only consumes
+                keys already typed; None waits indefinitely.
+        Returns:
            None if no full command yet.
            String command if Enter pressed.
         """
-        try:
-            ch = self.win_input.getch()
-        except curses.error:
-            return None
-            
-        if ch == curses.ERR:
-            return None
-            
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.refresh(force=True)
+            wait_ms = self.ms_to_next_second()
+            if deadline is not None:
+                wait_ms = min(wait_ms, max(0, int((deadline - time.monotonic()) * 1000)))
+            self.win_input.timeout(wait_ms)
+            try:
+                ch = self.win_input.getch()
+            except curses.error:
+                ch = curses.ERR
+
+            if ch != curses.ERR:
+                cmd = self._handle_key(ch)
+                if cmd is not None:
+                    return cmd
+            elif deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def _handle_key(self, ch):
+        """Applies one key to the input line; returns the command on Enter."""
         if ch == 10 or ch == 13: # Enter
             cmd = self.input_buffer.strip()
             self.input_buffer = ""
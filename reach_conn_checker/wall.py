@@ -0,0 +1,70 @@
+"""
+wall.py
+
+This module defines the wall (deck) of segments a session draws from.
+The 136 tiles are stored as one bytearray of tile slot ids (see tiles.py)
+and shuffled by an explicit random.Random, so a seed reproduces the whole
+session and a wall costs 136 bytes instead of 136 string references.
+"""
+
+import random
+
+from .tiles import TILE_NAMES, TILE_INDEX
+
+class Wall:
+    """
+    Shuffled wall of tile ids, drawn from the end.
+
+    Behaves like the old list deck where the game loop needs it:
+    pop() returns a tile string, len() is the number of drawable tiles
+    and an exhausted wall is falsy. The first `dead_wall` ids of the
+    array (the far end from the draw position) are never drawn.
+    """
+    __slots__ = ('ids', 'dead_wall', 'seed')
+
+    def __init__(self, seed=None, rng=None, dead_wall=0):
+        """
+        Args:
+            seed: Seed for a private random.Random (ignored if rng is given).
+            rng (random.Random): Shuffle source.
+            dead_wall (int): Tiles kept back from drawing.
+        """
+        self.seed = seed
+        self.dead_wall = dead_wall
+        self.ids = bytearray(index for index in range(34) for _ in range(4))
+        (rng if rng else random.Random(seed)).shuffle(self.ids)
+
+    @classmethod
+    def from_tiles(cls, tiles, dead_wall=0):
+        """Builds an unshuffled wall drawing `tiles` from the end, like list.pop()."""
+        wall = cls.__new__(cls)
+        wall.seed = None
+        wall.dead_wall = dead_wall
+        wall.ids = bytearray(TILE_INDEX[tile] for tile in tiles)
+        return wall
+
+    @property
+    def remaining(self):
+        """Tiles left to draw."""
+        return max(0, len(self.ids) - self.dead_wall)
+
+    def pop(self):
+        """Draws the next tile. Raises IndexError when the wall is exhausted."""
+        if len(self.ids) <= self.dead_wall:
+            raise IndexError("pop from exhausted wall")
+        return TILE_NAMES[self.ids.pop()]
+
+    def __len__(self):
+        return self.remaining
+
+    def __bool__(self):
+        return len(self.ids) > self.dead_wall
+
+    def __getitem__(self, key):
+        """Tile string(s) by position; position -1 is drawn next."""
+        if isinstance(key, slice):
+            return [TILE_NAMES[index] for index in self.ids[key]]
+        return TILE_NAMES[self.ids[key]]
+
+    def __repr__(self):
+        return f"Wall(remaining={self.remaining}, dead_wall={self.dead_wall})"
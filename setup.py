@@ -20,4 +20,7 @@ setup(
     install_requires=[
         "windows-curses; platform_system=='Windows'",
     ],
+    extras_require={
+        "batch": ["numpy"],
+    },
 )
@@ -0,0 +1,52 @@
+
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from reach_conn_checker.network_rules import validate_packet_structure, check_protocol_readiness
+from reach_conn_checker.tiles import HandCounts, TILE_NAMES, TILE_INDEX
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchRules(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(99)
+        self.hands = []
+        for _ in range(500):
+            # Narrow pools give many Agari/Tenpai hands and some 5-copy rows
+            pool = rng.choice([TILE_NAMES[:9], TILE_NAMES[:9] + TILE_NAMES[27:30], TILE_NAMES])
+            self.hands.append(rng.choices(pool, k=14))
+
+    def test_validate_matches_scalar(self):
+        from reach_conn_checker.batch_rules import validate_packet_batch
+
+        counts = np.array([HandCounts(h).counts for h in self.hands], dtype=np.uint8)
+        agari = validate_packet_batch(counts, chunk_size=128)
+        expected = [validate_packet_structure(h) for h in self.hands]
+        self.assertEqual(agari.tolist(), expected)
+
+    def test_readiness_matches_scalar(self):
+        from reach_conn_checker.batch_rules import check_readiness_batch
+
+        hands = [h[:13] for h in self.hands]
+        counts = np.array([HandCounts(h).counts for h in hands], dtype=np.uint8)
+        tenpai, waits = check_readiness_batch(counts, chunk_size=128)
+        for i, hand in enumerate(hands):
+            is_tenpai, wait_tiles = check_protocol_readiness(hand)
+            self.assertEqual(bool(tenpai[i]), is_tenpai)
+            expected = [False] * 34
+            for tile in wait_tiles:
+                expected[TILE_INDEX[tile]] = True
+            self.assertEqual(waits[i].tolist(), expected, hand)
+
+    def test_rejects_bad_shape(self):
+        from reach_conn_checker.batch_rules import validate_packet_batch
+
+        with self.assertRaises(ValueError):
+            validate_packet_batch(np.zeros((3, 33), dtype=np.uint8))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+
+import asyncio
+import curses
+import os
+import time
+import unittest
+from unittest import mock
+from reach_conn_checker.cli import run_session
+from test_tui import make_interface
+
+class ScriptedInterface:
+    """Feeds commands to run_session once the game reaches given points."""
+    FRAME_INTERVAL = 0.01
+
+    def __init__(self, commands):
+        self.commands = list(commands)
+        self.lines = []
+        self.pausing = False
+
+    def log(self, message, color_pair_idx=1):
+        self.lines.append(message)
+
+    def update_status(self, manager, cpu_agent=None, latency_check=False):
+        pass
+
+    def refresh(self, force=False):
+        pass
+
+    def ms_to_next_second(self):
+        return 1000
+
+    def pause(self, seconds):
+        raise AssertionError("run_session must not block in pause()")
+
+    async def pause_async(self, seconds):
+        self.pausing = True
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.pausing = False
+
+    def get_command(self, timeout=0):
+        if not self.commands:
+            return None
+        cmd, during_pause = self.commands[0]
+        if during_pause and not self.pausing:
+            return None
+        self.commands.pop(0)
+        return cmd
+
+class TestRunSession(unittest.TestCase):
+    def test_exit_interrupts_pause(self):
+        interface = ScriptedInterface([("ping 0", False), ("exit", True)])
+        start = time.monotonic()
+        self.assertIsNone(asyncio.run(run_session(interface)))
+        # Exited within a few frames of the 0.5 s CPU pause starting
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertIn("Packet forwarded", " ".join(interface.lines))
+
+class PipeStdin:
+    def __init__(self, fd):
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+class TestRunSessionScreen(unittest.TestCase):
+    def test_screen_is_flushed_while_waiting_for_input(self):
+        interface, patches = make_interface()
+        for p in patches:
+            self.addCleanup(p.stop)
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        os.set_blocking(read_fd, False)
+
+        def getch():
+            # Keys come from the pipe run_session watches with add_reader
+            try:
+                data = os.read(read_fd, 1)
+            except BlockingIOError:
+                return curses.ERR
+            return data[0] if data else curses.ERR
+
+        interface.win_input.getch = getch
+        # Keep the header clock from flushing during the test
+        interface.ms_to_next_second = lambda: 60000
+
+        def draws():
+            return sum(text.startswith("Incoming packet") for text, _, _ in interface.log_lines)
+
+        async def scenario():
+            session = asyncio.ensure_future(run_session(interface))
+            os.write(write_fd, b"ping 0\r")
+            # The CPU turn passes and the next draw is shown
+            deadline = time.monotonic() + 5
+            while draws() < 2 and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            self.assertEqual(draws(), 2)
+            # Waiting for the next command: nothing may be left unflushed
+            await asyncio.sleep(0.2)
+            self.assertFalse(interface._dirty)
+            os.write(write_fd, b"exit\r")
+            return await session
+
+        with mock.patch("sys.stdin", PipeStdin(read_fd)):
+            self.assertIsNone(asyncio.run(scenario()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+
+import unittest
+from reach_conn_checker.core import ConnectionManager
+from reach_conn_checker.network_rules import check_protocol_readiness
+
+class TestConnectionManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = ConnectionManager()
+        # 123m 456p 789s 23s 9m east-east: drop 9m for Tenpai on 1s/4s
+        self.manager.hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "3s", "9m", "east", "east"]
+
+    def test_reach_discard_seeds_readiness(self):
+        self.assertIn("9m", self.manager.check_reachability())
+
+        idx = self.manager.get_hand().index("9m")
+        self.assertEqual(self.manager.discard(idx), "9m")
+        # Readiness comes from the cached reach analysis
+        self.assertIsNotNone(self.manager._readiness)
+        self.assertEqual(self.manager.check_readiness(), check_protocol_readiness(self.manager.hand))
+        self.assertEqual(self.manager.check_readiness(), (True, ["1s", "4s"]))
+
+    def test_cache_invalidated_on_hand_change(self):
+        self.manager.discard_tile("9m")
+        self.assertTrue(self.manager.check_readiness()[0])
+
+        self.manager.add_tile("1s")
+        self.assertIsNone(self.manager._readiness)
+        self.manager.discard_tile("east")
+        self.assertEqual(self.manager.check_readiness(), check_protocol_readiness(self.manager.hand))
+
+    def test_readiness_kept_across_draw_and_discard(self):
+        self.manager.discard_tile("9m")
+        readiness = self.manager.check_readiness()
+        cached = self.manager._readiness
+
+        # Drawing a tile and forwarding it leaves the hand as it was
+        self.manager.add_tile("red")
+        self.manager.discard_tile("red")
+        self.assertIs(self.manager._readiness, cached)
+        self.assertEqual(self.manager.check_readiness(), readiness)
+
+        # Discarding a different tile changes the hand
+        self.manager.add_tile("red")
+        self.manager.discard_tile("east")
+        self.assertEqual(self.manager.check_readiness(), check_protocol_readiness(self.manager.hand))
+
+    def test_hand_stays_sorted(self):
+        self.manager.discard_tile("9m")
+        self.manager.add_tile("5m")
+        self.assertEqual(self.manager.last_drawn, "5m")
+        hand = self.manager.get_hand()
+        self.assertEqual(list(hand), sorted(hand, key=self.manager._sort_key))
+        self.assertEqual(hand[3], "5m")
+        self.assertEqual(self.manager.discard(3), "5m")
+        self.assertIsNone(self.manager.last_drawn)
+
+    def test_cached_waits_are_copies(self):
+        self.manager.discard_tile("9m")
+        _, waits = self.manager.check_readiness()
+        waits.append("red")
+        self.assertEqual(self.manager.check_readiness()[1], ["1s", "4s"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+
+import unittest
+from reach_conn_checker.cpu import CpuAgent
+from reach_conn_checker.network_rules import check_protocol_readiness
+
+class TestCpuAgent(unittest.TestCase):
+    def setUp(self):
+        # 123m 456p 789s 23s east-east: waiting on 1s/4s
+        self.cpu = CpuAgent(["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "3s", "east", "east"])
+
+    def test_can_ron_uses_waits(self):
+        self.assertTrue(self.cpu.can_ron("1s"))
+        self.assertTrue(self.cpu.can_ron("4s"))
+        self.assertFalse(self.cpu.can_ron("5s"))
+        self.assertEqual(self.cpu.wait_tiles(), frozenset(["1s", "4s"]))
+
+    def test_cache_invalidated_on_draw_and_discard(self):
+        self.assertTrue(self.cpu.can_ron("1s"))
+        self.cpu.draw("9m")
+        self.assertIsNone(self.cpu._waits)
+        # 14 tiles: no waits
+        self.assertFalse(self.cpu.can_ron("1s"))
+
+        self.cpu.discard()
+        self.assertEqual(len(self.cpu.hand), 13)
+        self.assertIsNone(self.cpu._waits)
+        self.assertEqual(self.cpu.wait_tiles(), frozenset(check_protocol_readiness(self.cpu.hand)[1]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+
+import asyncio
+import random
+import unittest
+from unittest import mock
+from reach_conn_checker.engine import (
+    GameEngine, AutoPlayer, CpuPlayer, play_headless, check_ron_opportunity, check_agari
+)
+from reach_conn_checker.core import ConnectionManager
+from reach_conn_checker import network_rules
+
+class ScriptedPlayer:
+    """Replays fixed commands, then exits."""
+    def __init__(self, commands):
+        self.commands = list(commands)
+        self.acknowledged = 0
+
+    def choose_ron(self, engine, tile):
+        return False
+
+    def next_command(self, engine):
+        return self.commands.pop(0) if self.commands else "exit"
+
+    def acknowledge(self, engine):
+        self.acknowledged += 1
+
+class RecordingInterface:
+    def __init__(self):
+        self.lines = []
+
+    def log(self, message, color_pair_idx=1):
+        self.lines.append(message)
+
+    def update_status(self, manager, cpu_agent=None, latency_check=False):
+        pass
+
+    def refresh(self):
+        pass
+
+    def pause(self, seconds):
+        pass
+
+class TestGameEngine(unittest.TestCase):
+    def test_headless_game_finishes(self):
+        for seed in range(5):
+            result = play_headless(AutoPlayer(rng=random.Random(seed)), seed=seed)
+            self.assertIn(result['winner'], (None, 'player', 'cpu'))
+            self.assertFalse(result['aborted'])
+            self.assertGreater(result['turns'], 0)
+            if result['winner']:
+                self.assertIn(result['win_type'], ('ron', 'tsumo'))
+
+    def test_seed_replays_session(self):
+        for seed in range(3):
+            first = play_headless(seed=seed)
+            second = play_headless(AutoPlayer(rng=random.Random(f"{seed}:player")), seed=seed)
+            self.assertEqual(first, second)
+
+    def test_cpu_vs_cpu(self):
+        for seed in range(3):
+            player = CpuPlayer(rng=random.Random(seed))
+            result = play_headless(player, seed=seed)
+            self.assertIn(result['winner'], (None, 'player', 'cpu'))
+            self.assertFalse(result['aborted'])
+            # The agent's hand follows the local host's decisions
+            self.assertLessEqual(len(player.agent.hand), 14)
+
+    def test_commands_and_exit(self):
+        player = ScriptedPlayer(["help", "bogus", "ping 99", "ping 0"])
+        interface = RecordingInterface()
+        engine = GameEngine(player, interface=interface, seed=1)
+        result = engine.run()
+
+        self.assertTrue(result['aborted'])
+        self.assertIn("Unknown command.", interface.lines)
+        self.assertIn("Invalid index.", interface.lines)
+        self.assertTrue(any(line.startswith("Packet forwarded: ") for line in interface.lines))
+        # One discard happened, then the second turn exited
+        self.assertEqual(result['turns'], 2)
+        self.assertEqual(len(engine.manager.hand), 14)
+
+    def test_player_waits(self):
+        manager = ConnectionManager()
+        # 123m 456p 789s 23s east-east: waiting on 1s/4s
+        manager.hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "3s", "east", "east"]
+        engine = GameEngine(ScriptedPlayer([]), manager=manager)
+        engine._update_player_waits()
+        self.assertEqual(engine.player_waits, frozenset(["1s", "4s"]))
+
+        manager.add_tile("9m")
+        engine._update_player_waits()
+        self.assertEqual(engine.player_waits, frozenset())
+
+    def test_reach_turns_reuse_waits(self):
+        manager = ConnectionManager()
+        # 123m 456p 789s 23s east-east: waiting on 1s/4s, already in Reach
+        manager.hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "3s", "east", "east"]
+        manager.is_reach = True
+        cpu_hand = ["1m", "4m", "7m", "1p", "4p", "7p", "2s", "5s", "8s", "east", "south", "west", "north"]
+        # Popped from the end: CPU deal, then 9p / white / 5m / green
+        manager.deck = ["green", "5m", "white", "9p"] + cpu_hand
+
+        calls = []
+        original = network_rules.check_protocol_readiness
+        def counting(hand, *args):
+            calls.append(list(hand))
+            return original(hand, *args)
+
+        with mock.patch.object(network_rules, "check_protocol_readiness", counting):
+            result = GameEngine(ScriptedPlayer([]), manager=manager).run()
+
+        self.assertIsNone(result['winner'])
+        self.assertEqual(result['turns'], 2)
+        # Only the initial scan: forwarded draws keep the cached waits
+        self.assertEqual(len(calls), 1)
+
+    def test_reach_counts_as_yaku(self):
+        manager = ConnectionManager()
+        # 123m 456p 789s 222s north: a north Ron completes the hand, no Yaku
+        manager.hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "2s", "2s", "north"]
+        self.assertFalse(check_ron_opportunity(manager, "north"))
+        manager.is_reach = True
+        self.assertTrue(check_ron_opportunity(manager, "north"))
+
+        manager.add_tile("north")
+        self.assertTrue(check_agari(manager, "north", is_tsumo=False))
+
+    def test_exhausted_deck(self):
+        manager = ConnectionManager()
+        # Leave just enough for the CPU deal
+        manager.deck = manager.deck[:13]
+        player = ScriptedPlayer([])
+        result = GameEngine(player, manager=manager).run()
+        self.assertIsNone(result['winner'])
+        self.assertEqual(result['turns'], 0)
+        self.assertFalse(result['aborted'])
+        self.assertEqual(player.acknowledged, 1)
+
+    def test_run_async_matches_run(self):
+        class AsyncAutoPlayer(AutoPlayer):
+            async def next_command(self, engine):
+                await asyncio.sleep(0)
+                return AutoPlayer.next_command(self, engine)
+
+        class TimerInterface(RecordingInterface):
+            def __init__(self):
+                super().__init__()
+                self.timers = []
+
+            async def pause_async(self, seconds):
+                self.timers.append(seconds)
+
+        for seed in range(3):
+            expected = play_headless(seed=seed)
+            interface = TimerInterface()
+            player = AsyncAutoPlayer(rng=random.Random(f"{seed}:player"))
+            engine = GameEngine(player, interface=interface, seed=seed)
+            self.assertEqual(asyncio.run(engine.run_async()), expected)
+            # One pacing timer per CPU turn (plus one per Reach draw)
+            self.assertGreaterEqual(len(interface.timers), expected['turns'] - 1)
+
+if __name__ == '__main__':
+    unittest.main()
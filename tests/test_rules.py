@@ -55,6 +55,69 @@ class TestNetworkRules(unittest.TestCase):
         candidates = check_discard_for_tenpai(hand)
         self.assertIn("9m", candidates)
 
+    def test_agari_chinitsu_many_shapes(self):
+        # 1112345678999m + 5m (Nine Gates shape completed)
+        hand = ["1m", "1m", "1m", "2m", "3m", "4m", "5m", "6m", "7m", "8m", "9m", "9m", "9m", "5m"]
+        self.assertTrue(validate_packet_structure(hand))
+
+    def test_table_matches_reference(self):
+        import random
+        from reach_conn_checker.network_rules import _parse_hand, _validate_reference
+
+        tiles = [f"{n}{s}" for s in "mps" for n in range(1, 10)]
+        tiles += ["east", "south", "west", "north", "white", "green", "red"]
+        rng = random.Random(1234)
+        for _ in range(2000):
+            # Narrow tile pools make Agari hands (and 5-copy anomalies) common
+            pool = rng.choice([tiles[:9], tiles[:9] + tiles[27:30], tiles])
+            hand = rng.choices(pool, k=14)
+            expected = _validate_reference(_parse_hand(hand))
+            self.assertEqual(validate_packet_structure(hand), expected, hand)
+
+    def test_effective_tiles(self):
+        from reach_conn_checker.network_rules import check_effective_tiles
+
+        # Same hand as above: dropping 9m waits on 1s/4s
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "3s", "9m", "east", "east"]
+        results = check_effective_tiles(hand, visible_tiles=["1s", "1s", "4s"])
+        best = results[0]
+        self.assertEqual(best['discard'], "9m")
+        self.assertEqual(best['shanten'], 0)
+        self.assertEqual(best['tiles'], {"1s": 2, "4s": 3})
+        self.assertEqual(best['total'], 5)
+
+        # 13-tile hands report a single entry without a discard
+        results = check_effective_tiles(hand[:11] + hand[12:])
+        self.assertEqual(len(results), 1)
+        self.assertIsNone(results[0]['discard'])
+        self.assertEqual(results[0]['tiles'], {"1s": 4, "4s": 4})
+
+    def test_decompose_cache(self):
+        from reach_conn_checker import network_rules as nr
+
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "1s", "2s", "3s", "1m", "1m"]
+        other = ["1m", "1m", "1m", "2p", "2p", "2p", "3s", "3s", "3s", "4s", "4s", "4s", "5m", "5m"]
+        old_size = nr.decompose_cache_info()['maxsize']
+        try:
+            nr.clear_decompose_cache()
+            nr.set_decompose_cache_size(1)
+            first = nr.decompose_hand(hand)
+            # Same tiles in another order share the canonical key
+            self.assertIs(nr.decompose_hand(list(reversed(hand))), first)
+            self.assertEqual(nr.decompose_cache_info()['hits'], 1)
+
+            # Structures are read-only
+            with self.assertRaises(TypeError):
+                first[0]['pair'] = (5, 5)
+
+            # Size bound: the older entry is evicted
+            nr.decompose_hand(other)
+            nr.decompose_hand(hand)
+            info = nr.decompose_cache_info()
+            self.assertEqual((info['hits'], info['misses'], info['size']), (1, 3, 1))
+        finally:
+            nr.set_decompose_cache_size(old_size)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -60,5 +60,23 @@ class TestScoreCalculator(unittest.TestCase):
         score = self.calc.calculate_score(han=2, fu=fu, is_oya=False, is_tsumo=False)
         self.assertEqual(score['total'], 1600)
 
+    def test_score_batch(self):
+        rows = [(2, 20, False, True), (1, 30, False, False), (13, 30, True, False), (0, 30, False, False)]
+        results = self.calc.score_batch(rows)
+        self.assertEqual(results[0], (1500, "Oya: 700, Ko: 400"))
+        self.assertEqual(results[1], (1000, "Target: 1000"))
+        self.assertEqual(results[2], (48000, "Target: 48000"))
+        self.assertEqual(results[3], (0, "0"))
+
+        # Same answers as the single-hand API
+        for row, (total, payments) in zip(rows, results):
+            score = self.calc.calculate_score(*row)
+            self.assertEqual((score['total'], score['payments']), (total, payments))
+
+    def test_score_outside_table(self):
+        # Han above the Yakuman cap and unrounded Fu still score correctly
+        self.assertEqual(self.calc.calculate_score(15, 40, is_oya=False, is_tsumo=False)['total'], 32000)
+        self.assertEqual(self.calc.calculate_score(1, 32, is_oya=False, is_tsumo=False)['total'], 1100)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,50 @@
+
+import unittest
+from reach_conn_checker.shanten import (
+    calculate_shanten, calculate_shanten_standard, calculate_shanten_chitoitsu
+)
+from reach_conn_checker.network_rules import check_protocol_readiness
+from reach_conn_checker.tiles import HandCounts
+
+class TestShanten(unittest.TestCase):
+    def test_agari(self):
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "1s", "2s", "3s", "1m", "1m"]
+        self.assertEqual(calculate_shanten(hand), -1)
+
+    def test_tenpai(self):
+        # 123m 456p 789s 23s east-east (Wait 1s/4s)
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "3s", "east", "east"]
+        self.assertEqual(calculate_shanten(hand), 0)
+
+    def test_two_away(self):
+        # 123m 456p 7s 9s 2s 5s east-east north: two partials short
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "9s", "2s", "5s", "east", "east", "north"]
+        self.assertEqual(calculate_shanten_standard(hand), 2)
+
+    def test_worst_case(self):
+        # Kokushi-style scatter is far from both supported forms
+        hand = ["1m", "9m", "1p", "9p", "1s", "9s", "east", "south", "west", "north", "white", "green", "red"]
+        self.assertEqual(calculate_shanten_standard(hand), 8)
+        self.assertEqual(calculate_shanten_chitoitsu(hand), 6)
+
+    def test_chitoitsu(self):
+        hand = ["1m", "1m", "2m", "2m", "1p", "1p", "9s", "9s", "east", "east", "south", "south", "white"]
+        self.assertEqual(calculate_shanten_chitoitsu(hand), 0)
+        # Four of a kind only counts as one pair
+        hand = ["1m", "1m", "1m", "1m", "1p", "1p", "9s", "9s", "east", "east", "south", "south", "white"]
+        self.assertEqual(calculate_shanten_chitoitsu(hand), 2)
+
+    def test_matches_readiness(self):
+        import random
+        from reach_conn_checker.tiles import TILE_NAMES
+
+        rng = random.Random(42)
+        for _ in range(300):
+            # Single-suit walls produce plenty of Tenpai hands
+            pool = rng.choice([TILE_NAMES[:9], TILE_NAMES])
+            hand = HandCounts(rng.sample(pool * 4, 13))
+            is_tenpai, _ = check_protocol_readiness(hand)
+            self.assertEqual(calculate_shanten(hand) == 0, is_tenpai, hand)
+
+if __name__ == '__main__':
+    unittest.main()
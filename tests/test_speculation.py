@@ -0,0 +1,53 @@
+
+import asyncio
+import unittest
+from unittest import mock
+from reach_conn_checker import cpu as cpu_module
+from reach_conn_checker import network_rules
+from reach_conn_checker.core import ConnectionManager
+from reach_conn_checker.cpu import CpuAgent
+from reach_conn_checker.speculation import Speculator, evaluate
+
+def make_state(seed):
+    manager = ConnectionManager(seed=seed)
+    cpu = CpuAgent()
+    cpu.initialize_hand(manager.deck)
+    manager.draw()
+    return manager, cpu
+
+class TestSpeculator(unittest.TestCase):
+    def test_primes_caches(self):
+        manager, cpu = make_state(3)
+        expected = evaluate(manager.hand.copy(), cpu.hand.copy())
+        speculator = Speculator()
+
+        async def think():
+            speculator.start(manager, cpu)
+            await asyncio.sleep(0)
+            return await speculator.apply(manager, cpu)
+
+        result = asyncio.run(think())
+        self.assertEqual(result, expected)
+        self.assertEqual(set(result['cpu_ron']), set(manager.hand))
+        # Both answers now come from cache
+        with mock.patch.object(cpu_module, "check_protocol_readiness", side_effect=AssertionError), \
+             mock.patch.object(network_rules, "map_tenpai_discards", side_effect=AssertionError):
+            for tile in manager.hand:
+                self.assertEqual(cpu.can_ron(tile), result['cpu_ron'][tile])
+            self.assertEqual(manager.check_reachability(), sorted(expected['reach_discards']))
+
+    def test_stale_state_is_not_applied(self):
+        manager, cpu = make_state(5)
+        speculator = Speculator()
+
+        async def think():
+            speculator.start(manager, cpu)
+            # The hand changes before the result is used
+            manager.discard(0)
+            return await speculator.apply(manager, cpu)
+
+        self.assertIsNone(asyncio.run(think()))
+        self.assertIsNone(cpu._waits)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+
+import json
+import random
+import statistics
+import unittest
+from reach_conn_checker.stats import RunningStats, Histogram, HandStats, HAN_EDGES
+from reach_conn_checker.engine import score_hand
+
+class TestRunningStats(unittest.TestCase):
+    def test_matches_statistics(self):
+        rng = random.Random(1)
+        values = [rng.uniform(0, 1000) for _ in range(500)]
+        stats = RunningStats()
+        for x in values:
+            stats.add(x)
+        self.assertEqual(stats.count, 500)
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.variance, statistics.variance(values), places=6)
+        self.assertEqual((stats.min, stats.max), (min(values), max(values)))
+
+    def test_merge(self):
+        values = list(range(1, 101))
+        whole, a, b = RunningStats(), RunningStats(), RunningStats()
+        for x in values:
+            whole.add(x)
+            (a if x % 3 else b).add(x)
+        a.merge(b)
+        self.assertEqual(a.count, whole.count)
+        self.assertAlmostEqual(a.mean, whole.mean)
+        self.assertAlmostEqual(a.variance, whole.variance)
+        self.assertEqual((a.min, a.max), (1, 100))
+        # Merging into or from an empty summary
+        self.assertEqual(RunningStats().merge(whole).to_dict(), whole.to_dict())
+        self.assertEqual(whole.merge(RunningStats()).count, 100)
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets(self):
+        hist = Histogram(HAN_EDGES)
+        for han in (1, 1, 2, 7, 13, 26):
+            hist.add(han)
+        self.assertEqual(hist.counts[HAN_EDGES.index(1)], 2)
+        self.assertEqual(hist.counts[HAN_EDGES.index(6)], 1)
+        self.assertEqual(hist.counts[-1], 2)
+        self.assertEqual(hist.total, 6)
+
+    def test_merge_needs_same_edges(self):
+        with self.assertRaises(ValueError):
+            Histogram((0, 1)).merge(Histogram((0, 2)))
+
+class TestHandStats(unittest.TestCase):
+    def test_add_result_and_json(self):
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2m", "3m", "4m", "5s", "5s"]
+        res = score_hand(hand, "5s", is_tsumo=False, is_reach=True)
+        stats = HandStats()
+        stats.add_result(res)
+        stats.add(1, 30, 1000, res['yaku'][:1])
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.points.max, res['score']['total'])
+        self.assertEqual(stats.yaku[res['yaku'][0]], 2)
+
+        restored = HandStats.from_json(stats.to_json())
+        self.assertEqual(restored.to_dict(), json.loads(stats.to_json()))
+        restored.merge(stats)
+        self.assertEqual(restored.count, 4)
+        self.assertEqual(restored.han_hist.total, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+
+import unittest
+from reach_conn_checker.tiles import (
+    HandCounts, SortedHand, count_vector, TILES, get_tile, tile_sort_key, tile_code
+)
+from reach_conn_checker.network_rules import (
+    validate_packet_structure, check_protocol_readiness, decompose_hand
+)
+from reach_conn_checker.yaku_rules import YakuChecker
+
+class TestHandCounts(unittest.TestCase):
+    def test_roundtrip(self):
+        hand = ["east", "1m", "9s", "1m", "white", "5p"]
+        counts = HandCounts(hand)
+        self.assertEqual(len(counts), 6)
+        self.assertEqual(counts.count("1m"), 2)
+        self.assertIn("white", counts)
+        self.assertNotIn("red", counts)
+        # Iteration is in slot order (m -> p -> s -> winds -> dragons)
+        self.assertEqual(counts.to_tiles(), ["1m", "1m", "5p", "9s", "east", "white"])
+
+    def test_add_remove(self):
+        counts = HandCounts(["1m"])
+        counts.add("2m")
+        counts.remove("1m")
+        self.assertEqual(counts.to_tiles(), ["2m"])
+        with self.assertRaises(ValueError):
+            counts.remove("1m")
+
+    def test_sorted_hand(self):
+        hand = SortedHand(["red", "3m", "east", "1m", "3m"])
+        self.assertEqual(list(hand), ["1m", "3m", "3m", "east", "red"])
+        self.assertEqual(hand[3], "east")
+
+        hand.add("2m")
+        hand.add("9s")
+        self.assertEqual(list(hand), ["1m", "2m", "3m", "3m", "9s", "east", "red"])
+        self.assertEqual(hand.pop(2), "3m")
+        hand.remove("east")
+        self.assertEqual(list(hand), ["1m", "2m", "3m", "9s", "red"])
+        self.assertEqual(hand.index("9s"), 3)
+        # Counts follow the list
+        self.assertEqual(hand, HandCounts(["1m", "2m", "3m", "9s", "red"]))
+        self.assertEqual(len(hand), 5)
+
+        plus = hand.with_tile("4m")
+        self.assertEqual(len(plus), 6)
+        self.assertEqual(len(hand), 5)
+
+    def test_tile_registry(self):
+        self.assertEqual(len(TILES), 34)
+        self.assertIs(get_tile("5p"), TILES[13])
+        self.assertIsNone(get_tile("joker"))
+
+        tile = get_tile("east")
+        self.assertEqual((tile.id, tile.int_code, tile.suit, tile.number), (27, 31, 'z', 1))
+        self.assertEqual(tile.code, "HOST_E")
+        self.assertEqual(tile_code("7s"), "THRD_36")
+        self.assertEqual(tile_code("joker"), "UNKNOWN")
+
+        # Sort keys follow the slot order; unknown tiles sort last
+        keys = [tile_sort_key(t.name) for t in TILES]
+        self.assertEqual(keys, sorted(keys))
+        self.assertGreater(tile_sort_key("unknown"), tile_sort_key("joker"))
+        self.assertGreater(tile_sort_key("joker"), tile_sort_key("red"))
+
+    def test_count_vector(self):
+        counts = HandCounts(["1m", "red"])
+        self.assertIs(count_vector(counts), counts.counts)
+        copied = count_vector(counts, copy=True)
+        self.assertEqual(copied, counts.counts)
+        self.assertIsNot(copied, counts.counts)
+        self.assertEqual(count_vector(["1m", "red"]), counts.counts)
+
+    def test_rule_engine_accepts_counts(self):
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "3s", "east", "east"]
+        is_tenpai, waits = check_protocol_readiness(HandCounts(hand))
+        self.assertTrue(is_tenpai)
+        self.assertEqual(waits, ["1s", "4s"])
+
+        complete = HandCounts(hand)
+        complete.add("1s")
+        self.assertTrue(validate_packet_structure(complete))
+        self.assertEqual(decompose_hand(complete), decompose_hand(complete.to_tiles()))
+
+        result = YakuChecker(complete, win_tile="1s", is_tsumo=True).execute()
+        self.assertIn("Menzen Tsumo (Self-Host)", result['yaku'])
+
+if __name__ == '__main__':
+    unittest.main()
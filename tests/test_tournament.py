@@ -0,0 +1,97 @@
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from reach_conn_checker import tournament
+from reach_conn_checker.tournament import run_tournament, play_game, make_shards, TournamentTotals
+
+class TestTournament(unittest.TestCase):
+    def test_game_is_reproducible(self):
+        self.assertEqual(play_game(5, 3), play_game(5, 3))
+
+    def test_shards_cover_games(self):
+        shards = make_shards(1, 10, 4)
+        self.assertEqual([(s, a, b) for _, s, a, b in shards], [(0, 0, 4), (1, 4, 8), (2, 8, 10)])
+
+    def test_summary_counts(self):
+        summary = run_tournament(12, seed=2, workers=1, shard_size=5)
+        self.assertEqual(summary['games'], 12)
+        sides = summary['sides']
+        self.assertEqual(sides['player']['wins'] + sides['cpu']['wins'] + summary['draws'], 12)
+        # Every Ron is a deal-in by the other side
+        self.assertEqual(sides['player']['ron'], sides['cpu']['deal_ins'])
+        self.assertEqual(sides['cpu']['ron'], sides['player']['deal_ins'])
+
+    def test_pool_matches_in_process(self):
+        serial = run_tournament(8, seed=4, workers=1, shard_size=2)
+        pooled = run_tournament(8, seed=4, workers=2, shard_size=2)
+        # Shards merge in completion order; only float rounding may differ
+        for side in ('player', 'cpu'):
+            for key in ('wins', 'tsumo', 'deal_ins', 'han_hist', 'fu_hist', 'yaku'):
+                self.assertEqual(serial['sides'][side][key], pooled['sides'][side][key])
+            self.assertAlmostEqual(serial['sides'][side]['avg_points'], pooled['sides'][side]['avg_points'])
+        self.assertEqual(serial['draws'], pooled['draws'])
+
+    def test_totals_merge_and_round_trip(self):
+        records = [
+            {'winner': 'player', 'win_type': 'ron', 'turns': 10, 'han': 2, 'fu': 30, 'points': 2000, 'yaku': ['Reach', 'Tanyao']},
+            {'winner': 'cpu', 'win_type': 'tsumo', 'turns': 14, 'han': 1, 'fu': 40, 'points': 1300, 'yaku': ['Menzen Tsumo']},
+            {'winner': None, 'win_type': None, 'turns': 60, 'han': 0, 'fu': 0, 'points': 0, 'yaku': []},
+            {'winner': 'player', 'win_type': 'tsumo', 'turns': 6, 'han': 3, 'fu': 30, 'points': 4000, 'yaku': ['Reach']},
+        ]
+        whole = TournamentTotals()
+        left, right = TournamentTotals(), TournamentTotals()
+        for i, record in enumerate(records):
+            whole.add(record)
+            (left if i < 2 else right).add(record)
+        merged = TournamentTotals.from_dict(json.loads(json.dumps(left.to_dict())))
+        merged.merge(TournamentTotals.from_dict(right.to_dict()))
+        self.assertEqual(merged.summary(), whole.summary())
+
+        player = whole.summary()['sides']['player']
+        self.assertEqual((player['wins'], player['ron'], player['tsumo']), (2, 1, 1))
+        self.assertEqual(player['avg_points'], 3000)
+        self.assertEqual(player['avg_turns_to_win'], 8)
+        self.assertEqual(player['yaku'], {'Reach': 2, 'Tanyao': 1})
+        self.assertEqual(whole.summary()['sides']['cpu']['deal_ins'], 1)
+
+    def test_checkpoint_resume(self):
+        expected = run_tournament(6, seed=9, workers=1, shard_size=2)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "run.jsonl")
+            run_tournament(6, seed=9, workers=1, shard_size=2, checkpoint=path)
+            with open(path) as f:
+                lines = f.readlines()
+            self.assertEqual(len(lines), 3)
+            # Keep one shard plus a line cut off mid-write
+            with open(path, "w") as f:
+                f.write(lines[0] + lines[1][:20])
+
+            played = []
+            original = tournament.play_shard
+            tournament.play_shard = lambda task: played.append(task[1]) or original(task)
+            try:
+                resumed = run_tournament(6, seed=9, workers=1, shard_size=2, checkpoint=path)
+            finally:
+                tournament.play_shard = original
+            self.assertEqual(resumed, expected)
+            self.assertEqual(sorted(played), [1, 2])
+            with open(path) as f:
+                shards = sorted(json.loads(line)['shard'] for line in f)
+            self.assertEqual(shards, [0, 1, 2])
+
+    def test_resume_with_int_or_str_seed(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "run.jsonl")
+            first = run_tournament(4, seed=0, workers=1, shard_size=2, checkpoint=path)
+            # The CLI passes the seed as a string: nothing is replayed
+            with mock.patch.object(tournament, "play_shard", side_effect=AssertionError):
+                resumed = run_tournament(4, seed="0", workers=1, shard_size=2, checkpoint=path)
+            self.assertEqual(resumed, first)
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+
+import asyncio
+import curses
+import unittest
+from unittest import mock
+from reach_conn_checker import tui
+
+class FakeWindow:
+    """Records what the interface draws; getch() replays queued keys."""
+    def __init__(self, rows=24, cols=80, keys=()):
+        self.rows, self.cols = rows, cols
+        self.keys = list(keys)
+        self.timeouts = []
+        self.writes = []
+        self.scrolled = 0
+        self.refreshes = 0
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+    def getch(self):
+        return self.keys.pop(0) if self.keys else curses.ERR
+
+    def timeout(self, ms):
+        self.timeouts.append(ms)
+
+    def addstr(self, *args):
+        self.writes.append(args)
+
+    def scroll(self, n=1):
+        self.scrolled += n
+
+    def noutrefresh(self):
+        self.refreshes += 1
+
+    def __getattr__(self, name):
+        # clear, erase, keypad, scrollok, hline, move, ...
+        return lambda *args: None
+
+def make_interface(keys=()):
+    """CursesInterface on fake windows; the input window gets `keys`."""
+    windows = []
+
+    def newwin(h, w, y, x):
+        windows.append(FakeWindow(h, w, keys=keys if len(windows) == 2 else ()))
+        return windows[-1]
+
+    patches = [
+        mock.patch.object(tui.curses, name, create=True, new=lambda *a: 0)
+        for name in ("start_color", "use_default_colors", "init_pair", "curs_set", "color_pair", "doupdate")
+    ] + [mock.patch.object(tui.curses, "newwin", new=newwin)]
+    for p in patches:
+        p.start()
+    interface = tui.CursesInterface(FakeWindow())
+    return interface, patches
+
+class TestCursesInput(unittest.TestCase):
+    def setUp(self):
+        self.patches = []
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def interface(self, keys=()):
+        interface, self.patches = make_interface(keys)
+        return interface
+
+    def test_command_from_keys(self):
+        keys = [ord(c) for c in "pinx"] + [127, ord("g"), curses.KEY_LEFT, ord("n"), curses.KEY_RIGHT, 10]
+        interface = self.interface(keys)
+        self.assertEqual(interface.get_command(timeout=None), "pinng")
+        self.assertEqual(interface.input_buffer, "")
+
+    def test_blocking_read_uses_timeout(self):
+        interface = self.interface([ord("a")])
+        self.assertIsNone(interface.get_command(timeout=0))
+        self.assertEqual(interface.input_buffer, "a")
+        # Every read blocks for a bounded time instead of busy-polling
+        timeouts = interface.win_input.timeouts
+        self.assertTrue(timeouts)
+        self.assertTrue(all(0 <= ms <= interface.MAX_INPUT_WAIT_MS for ms in timeouts))
+
+    def test_header_redraws_once_per_second(self):
+        interface = self.interface()
+        stdscr = interface.stdscr
+        with mock.patch.object(tui.time, "time", return_value=1000.2):
+            interface.refresh()
+            drawn = len(stdscr.writes)
+            interface.refresh()
+            interface.refresh()
+            self.assertEqual(len(stdscr.writes), drawn)
+        with mock.patch.object(tui.time, "time", return_value=1001.0):
+            interface.refresh()
+        self.assertEqual(len(stdscr.writes), drawn + 1)
+
+class TestCursesLog(unittest.TestCase):
+    def setUp(self):
+        self.interface, self.patches = make_interface()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_log_draws_only_new_rows(self):
+        interface = self.interface
+        win = interface.win_log
+        height = interface.win_log_h
+        for i in range(height + 5):
+            interface.log(f"line {i}")
+        self.assertEqual(len(win.writes), height + 5)
+        self.assertEqual(win.scrolled, 5)
+        self.assertEqual(win.writes[-1][:3], (height - 1, 0, f"line {height + 4}"))
+
+        # A wrapped message adds one write per row
+        before = len(win.writes)
+        interface.log("x" * (interface.cols + 10) + "\nnext")
+        self.assertEqual(len(win.writes) - before, 3)
+
+    def test_backlog_is_bounded_and_rewrapped_on_resize(self):
+        interface = self.interface
+        for i in range(interface.max_log_lines + 20):
+            interface.log("word " * 30)
+        self.assertEqual(len(interface.log_lines), interface.max_log_lines)
+        self.assertEqual(len(interface.log_lines[-1][2]), 2)
+
+        interface.stdscr.cols = 40
+        interface.resize()
+        self.assertEqual(len(interface.log_lines[-1][2]), 4)
+        # The repaint shows the newest rows that fit
+        win = interface.win_log
+        self.assertEqual(len(win.writes), interface.win_log_h)
+
+class FakeManager:
+    def __init__(self, hand, is_reach=False):
+        self.hand = hand
+        self.is_reach = is_reach
+
+    def get_hand(self):
+        return self.hand
+
+class TestCursesFrames(unittest.TestCase):
+    def setUp(self):
+        self.interface, self.patches = make_interface()
+        self.doupdate = mock.Mock()
+        patch = mock.patch.object(tui.curses, "doupdate", new=self.doupdate)
+        patch.start()
+        self.patches.append(patch)
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_one_doupdate_per_frame(self):
+        interface = self.interface
+        interface.refresh(force=True)
+        self.doupdate.reset_mock()
+        log_refreshes = interface.win_log.refreshes
+
+        for i in range(10):
+            interface.log(f"line {i}")
+        interface.update_status(FakeManager(["1m", "2m"]))
+        interface.refresh(force=True)
+        self.assertEqual(self.doupdate.call_count, 1)
+        self.assertEqual(interface.win_log.refreshes, log_refreshes + 1)
+
+        # Nothing changed: no frame is written
+        interface.refresh(force=True)
+        self.assertEqual(self.doupdate.call_count, 1)
+
+    def test_frames_are_rate_limited(self):
+        interface = self.interface
+        with mock.patch.object(tui.time, "monotonic", return_value=50.0):
+            interface.refresh(force=True)
+            interface.log("a")
+            interface.refresh()
+            interface.log("b")
+            interface.refresh()
+            self.assertEqual(self.doupdate.call_count, 1)
+            # A forced frame (before blocking) writes what was held back
+            interface.refresh(force=True)
+            self.assertEqual(self.doupdate.call_count, 2)
+
+    def test_held_back_frame_is_flushed_on_loop(self):
+        interface = self.interface
+
+        async def burst():
+            interface.refresh(force=True)
+            interface.log("a")
+            interface.refresh()
+            # No further refresh() call: the frame must still go out
+            await asyncio.sleep(interface.FRAME_INTERVAL * 3)
+
+        asyncio.run(burst())
+        self.assertFalse(interface._dirty)
+        self.assertEqual(self.doupdate.call_count, 2)
+
+    def test_status_skips_unchanged_state(self):
+        interface = self.interface
+        win = interface.win_status
+        interface.update_status(FakeManager(["1m", "2m"]))
+        drawn = len(win.writes)
+        self.assertTrue(drawn)
+        interface.update_status(FakeManager(["1m", "2m"]))
+        self.assertEqual(len(win.writes), drawn)
+        interface.update_status(FakeManager(["1m", "2m"], is_reach=True))
+        self.assertGreater(len(win.writes), drawn)
+
+if __name__ == '__main__':
+    unittest.main()
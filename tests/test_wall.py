@@ -0,0 +1,54 @@
+
+import random
+import unittest
+from collections import Counter
+from reach_conn_checker.wall import Wall
+from reach_conn_checker.tiles import TILE_NAMES
+from reach_conn_checker.core import ConnectionManager
+
+class TestWall(unittest.TestCase):
+    def test_full_set(self):
+        wall = Wall(seed=7)
+        self.assertEqual(len(wall), 136)
+        tiles = [wall.pop() for _ in range(136)]
+        self.assertEqual(Counter(tiles), Counter({name: 4 for name in TILE_NAMES}))
+        self.assertFalse(wall)
+        with self.assertRaises(IndexError):
+            wall.pop()
+
+    def test_seed_is_reproducible(self):
+        self.assertEqual(Wall(seed=3)[:], Wall(seed=3)[:])
+        self.assertEqual(Wall(rng=random.Random(3))[:], Wall(seed=3)[:])
+        self.assertNotEqual(Wall(seed=3)[:], Wall(seed=4)[:])
+
+    def test_dead_wall(self):
+        wall = Wall(seed=1, dead_wall=14)
+        self.assertEqual(wall.remaining, 122)
+        for _ in range(122):
+            wall.pop()
+        self.assertEqual(len(wall), 0)
+        self.assertFalse(wall)
+        with self.assertRaises(IndexError):
+            wall.pop()
+
+    def test_from_tiles_pops_from_end(self):
+        wall = Wall.from_tiles(["1m", "east", "red"])
+        self.assertEqual(wall[-1], "red")
+        self.assertEqual([wall.pop(), wall.pop(), wall.pop()], ["red", "east", "1m"])
+
+    def test_manager_seed(self):
+        first = ConnectionManager(seed=42)
+        second = ConnectionManager(seed=42)
+        self.assertEqual(list(first.hand), list(second.hand))
+        self.assertEqual(first.deck[:], second.deck[:])
+        self.assertEqual(len(first.deck), 136 - 13)
+
+    def test_manager_keeps_exhausted_wall(self):
+        # Only dead-wall tiles left: the given wall is used, not replaced
+        wall = Wall(seed=1, dead_wall=136)
+        manager = ConnectionManager(wall=wall)
+        self.assertIs(manager.deck, wall)
+        self.assertEqual(len(manager.hand), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 
 import unittest
-from reach_conn_checker.yaku_rules import YakuChecker
+from reach_conn_checker.yaku_rules import YakuChecker, structure_features
+from reach_conn_checker.network_rules import decompose_hand
 
 class TestYakuChecker(unittest.TestCase):
     
@@ -158,5 +159,47 @@ class TestYakuChecker(unittest.TestCase):
         result = checker.execute()
         self.assertIn("Sanshoku Douko (Cross-Platform Triplets)", result['yaku'])
 
+    def test_chanta_seat_wind(self):
+        # 123m 789p 111s south-south-south 9m9m, seat wind South
+        hand = ["1m", "2m", "3m", "7p", "8p", "9p", "1s", "1s", "1s", "south", "south", "south", "9m", "9m"]
+        checker = YakuChecker(hand, win_tile="1m", jikaze='south')
+        result = checker.execute()
+        self.assertIn("Chanta (Edge Routing)", result['yaku'])
+        self.assertIn("Yakuhai: Seat Wind", result['yaku'])
+        self.assertNotIn("Yakuhai: Round Wind", result['yaku'])
+
+    def test_structure_features(self):
+        # 123m 123m 456m 777s 55p
+        hand = ["1m", "2m", "3m", "1m", "2m", "3m", "4m", "5m", "6m", "7s", "7s", "7s", "5p", "5p"]
+        features = [structure_features(s) for s in decompose_hand(hand)]
+        f = features[0]
+        self.assertEqual(f.seq_count, 3)
+        self.assertEqual(f.seqs, (1 << 0) | (1 << 3))
+        self.assertEqual(f.peiko, 1)
+        self.assertEqual(f.triplets, 1 << 24)
+        self.assertEqual(f.pair, 1 << 13)
+
+    def test_best_structure_by_points(self):
+        # 2223455 5s + west/white triplets, Ron on 4s.
+        # 234s 555s 22s (50 Fu) vs 222s 345s 55s (60 Fu, Kanchan wait):
+        # equal Han, the higher Fu wins.
+        hand = ["2s", "2s", "2s", "3s", "4s", "5s", "5s", "5s", "west", "west", "west", "white", "white", "white"]
+        result = YakuChecker(hand, win_tile="4s").execute()
+        self.assertIn("San Ankou (Three Concealed Triplets)", result['yaku'])
+        self.assertEqual(result['han'], 6)
+        self.assertEqual(result['fu'], 60)
+
+    def test_has_yaku(self):
+        # 123m 456p 789s 222s north-north: complete but no Yaku on Ron
+        hand = ["1m", "2m", "3m", "4p", "5p", "6p", "7s", "8s", "9s", "2s", "2s", "2s", "north", "north"]
+        checker = YakuChecker(hand, win_tile="3m")
+        self.assertFalse(checker.has_yaku())
+        self.assertEqual(checker.execute()['yaku'], [])
+
+        self.assertTrue(YakuChecker(hand, win_tile="3m", is_reach=True).has_yaku())
+        self.assertTrue(YakuChecker(hand, win_tile="3m", is_tsumo=True).has_yaku())
+        # Not Agari at all
+        self.assertFalse(YakuChecker(hand[:-1] + ["east"], win_tile="east", is_tsumo=True).has_yaku())
+
 if __name__ == '__main__':
     unittest.main()